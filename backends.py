@@ -1,24 +1,54 @@
+import functools
+import heapq
+import sys
 import numpy as np
 from decimal import Decimal
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from models import EquityAlloc, ProjectAlloc, BondAlloc, ProjectInfo
-from ledger import Ledger
+from ledger import Ledger, _to_units
 import uuid
 from config_loader import ConfigLoader
 
+
+# Decimal constants used on every trade and payout, parsed once
+_ZERO = Decimal('0.00')
+_ONE = Decimal('1.0')
+_CENT = Decimal('0.01')
+_MICRO = Decimal('0.000001')
+
+
+@functools.lru_cache(maxsize=512)
+def _lognormal_mean(expected_return_pct: Decimal) -> float:
+    """Log-space mean of a project's success multiplier; pure in the expected return."""
+    return float(np.log(1 + float(expected_return_pct)))
+
+
 class Stock:
     """Represents a stock with price information."""
     def __init__(self, ticker: str, price: Decimal):
-        self.ticker = ticker
+        self.ticker = sys.intern(ticker)
         self.price = price
 
+    @property
+    def price(self) -> Decimal:
+        return self._price
+
+    @price.setter
+    def price(self, value: Decimal) -> None:
+        # Keep the ledger's integer-unit price in step with the Decimal one
+        self._price = value
+        self.price_units = _to_units(value)
+
 
 class Project:
     """Represents an investment project."""
+    __slots__ = ('project_id', 'name', 'required_investment', 'expected_return_pct', 'risk_level',
+                 'weeks_to_completion', 'success_probability', 'remaining_funding')
+
     def __init__(self, project_id: str, name: str, required_investment: Decimal,
                  expected_return_pct: Decimal, risk_level: str, weeks_to_completion: int,
                  success_probability: Decimal = Decimal('0.7')):
-        self.project_id = project_id
+        self.project_id = sys.intern(project_id)
         self.name = name
         self.required_investment = required_investment
         self.expected_return_pct = expected_return_pct
@@ -28,13 +58,34 @@ class Project:
         self.remaining_funding = required_investment
         
 
+class _WeekClock:
+    """Week counter shared by a ProjectBackend and its investments."""
+    __slots__ = ('week',)
+
+    def __init__(self):
+        self.week = 0
+
+
 class ProjectInvestment:
     """Represents an agent's investment in a project."""
-    def __init__(self, project_id: str, amount_invested: Decimal, weeks_remaining: int):
-        self.project_id = project_id
+    __slots__ = ('project_id', 'amount_invested', 'due_week', '_clock')
+
+    def __init__(self, project_id: str, amount_invested: Decimal, weeks_remaining: int,
+                 clock: Optional[_WeekClock] = None):
+        self.project_id = sys.intern(project_id)
         self.amount_invested = amount_invested
+        self._clock = clock if clock is not None else _WeekClock()
         self.weeks_remaining = weeks_remaining
 
+    @property
+    def weeks_remaining(self) -> int:
+        # Derived from the shared clock so ticking never touches each investment
+        return self.due_week - self._clock.week
+
+    @weeks_remaining.setter
+    def weeks_remaining(self, value: int) -> None:
+        self.due_week = self._clock.week + value
+
 class TradeBackend:
     """Handles stock trading operations."""
 
@@ -45,6 +96,9 @@ class TradeBackend:
         
         stocks_config = config_loader.load_stocks_config()
         self.stocks = {}
+        # Bumped whenever prices change so ledgers can reuse a cached NAV
+        self.price_version = 0
+        self._price_array_cache: Optional[Tuple[int, np.ndarray]] = None
         
         for ticker, stock_data in stocks_config.items():
             self.stocks[ticker] = Stock(
@@ -57,6 +111,28 @@ class TradeBackend:
         stock = self.stocks.get(ticker)
         return stock.price if stock else None
 
+    def get_prices(self, tickers: List[str]) -> Dict[str, Optional[Decimal]]:
+        """Get current prices for several stocks in one call."""
+        stocks = self.stocks
+        return {ticker: stocks[ticker].price if ticker in stocks else None for ticker in tickers}
+
+    def get_price_array(self) -> np.ndarray:
+        """Get all stock prices as a float64 array, in self.stocks order.
+
+        Rebuilt only when price_version changes; treat the result as read-only.
+        """
+        cache = self._price_array_cache
+        if cache is None or cache[0] != self.price_version:
+            prices = np.fromiter((float(stock.price) for stock in self.stocks.values()),
+                                 dtype=np.float64, count=len(self.stocks))
+            cache = self._price_array_cache = (self.price_version, prices)
+        return cache[1]
+
+    def get_price_units(self, ticker: str) -> Optional[int]:
+        """Get current price of a stock in ledger integer units."""
+        stock = self.stocks.get(ticker)
+        return stock.price_units if stock else None
+
     def execute_allocation(self, allocation: EquityAlloc, ledger: Ledger) -> bool:
         """
         Execute an equity allocation (buy or sell).
@@ -87,7 +163,7 @@ class TradeBackend:
             return False
 
         # Calculate shares to buy
-        shares = (usd_amount / price).quantize(Decimal('0.000001'))
+        shares = (usd_amount / price).quantize(_MICRO)
 
         # Add to ledger
         return ledger.add_asset("EQUITY", ticker, shares, usd_amount)
@@ -95,16 +171,10 @@ class TradeBackend:
     def _execute_sell(self, ticker: str, usd_amount: Decimal, price: Decimal, ledger: Ledger) -> bool:
         """Execute a sell order."""
         # Calculate shares to sell
-        shares_to_sell = (usd_amount / price).quantize(Decimal('0.000001'))
-
-        # Check if agent has enough shares
-        existing_asset = None
-        for asset in ledger.assets:
-            if asset.asset_type == "EQUITY" and asset.identifier == ticker:
-                existing_asset = asset
-                break
+        shares_to_sell = (usd_amount / price).quantize(_MICRO)
 
-        if not existing_asset or existing_asset.quantity < shares_to_sell:
+        # Check if agent has enough shares (compared in ledger integer units)
+        if ledger.holding_quantity_units("EQUITY", ticker) < _to_units(shares_to_sell):
             return False
 
         # Execute the sale
@@ -113,9 +183,13 @@ class TradeBackend:
 
     def update_prices(self, price_changes: Dict[str, Decimal]):
         """Update stock prices from market data engine."""
+        stocks = self.stocks
         for ticker, new_price in price_changes.items():
-            if ticker in self.stocks and new_price is not None:
-                self.stocks[ticker].price = Decimal(str(new_price))
+            stock = stocks.get(ticker)
+            if stock is not None and new_price is not None:
+                # Decimal inputs are stored as-is; floats go through str for exact digits
+                stock.price = new_price if isinstance(new_price, Decimal) else Decimal(str(new_price))
+        self.price_version += 1
 
 
 class ProjectBackend:
@@ -124,6 +198,14 @@ class ProjectBackend:
     def __init__(self, config_loader: Optional[ConfigLoader] = None):
         self.available_projects: Dict[str, Project] = {}
         self.agent_investments: List[ProjectInvestment] = []
+        # Active investments as a min-heap of (due_week, sequence, investment)
+        self._clock = _WeekClock()
+        self._completion_heap: List[Tuple[int, int, ProjectInvestment]] = []
+        self._investment_seq = 0
+        # Bumped whenever a project's remaining funding changes; keys the
+        # memoized get_available_projects() result
+        self._version = 0
+        self._cached_available: Optional[Tuple[int, Tuple[ProjectInfo, ...]]] = None
         self._initialize_sample_projects(config_loader)
         
     def _initialize_sample_projects(self, config_loader: Optional[ConfigLoader] = None):
@@ -144,9 +226,17 @@ class ProjectBackend:
                 success_probability=Decimal(project_data['success_probability'])
             )
             self.available_projects[project.project_id] = project
+        self._version += 1
             
+    def get_project(self, project_id: str) -> Optional[Project]:
+        """Get a project by id (funded or not), or None if unknown."""
+        return self.available_projects.get(project_id)
+
     def get_available_projects(self) -> List[ProjectInfo]:
         """Get list of projects available for investment."""
+        if self._cached_available is not None and self._cached_available[0] == self._version:
+            return list(self._cached_available[1])
+
         project_infos = []
         for project in self.available_projects.values():
             if project.remaining_funding > 0:
@@ -159,6 +249,7 @@ class ProjectBackend:
                     weeks_to_completion=project.weeks_to_completion
                 )
                 project_infos.append(info)
+        self._cached_available = (self._version, tuple(project_infos))
         return project_infos
         
     def execute_allocation(self, allocation: ProjectAlloc, ledger: Ledger) -> bool:
@@ -184,20 +275,24 @@ class ProjectBackend:
         actual_investment = min(investment_amount, project.remaining_funding)
         
         # Execute the investment
-        success = ledger.add_asset("PROJECT", project_id, Decimal('1.0'), actual_investment)
+        success = ledger.add_asset("PROJECT", project_id, _ONE, actual_investment)
         if not success:
             return False
             
         # Update project funding
         project.remaining_funding -= actual_investment
+        self._version += 1
         
         # Track the investment
         investment = ProjectInvestment(
             project_id=project_id,
             amount_invested=actual_investment,
-            weeks_remaining=project.weeks_to_completion
+            weeks_remaining=project.weeks_to_completion,
+            clock=self._clock
         )
         self.agent_investments.append(investment)
+        self._investment_seq += 1
+        heapq.heappush(self._completion_heap, (investment.due_week, self._investment_seq, investment))
         
         return True
         
@@ -209,28 +304,31 @@ class ProjectBackend:
         news_events = []
         completed_investments = []
         
-        for investment in self.agent_investments:
-            investment.weeks_remaining -= 1
+        # Advancing the shared clock counts down every investment at once;
+        # only the ones now due are popped off the heap
+        self._clock.week += 1
+        heap = self._completion_heap
+        while heap and heap[0][0] <= self._clock.week:
+            investment = heapq.heappop(heap)[2]
             
-            if investment.weeks_remaining <= 0:
-                # Project completed - calculate payout
-                payout = self._calculate_project_payout(investment)
-                
-                # Remove the project asset from ledger
-                ledger.remove_asset("PROJECT", investment.project_id, Decimal('1.0'))
-                
-                # Add cash payout
-                ledger.cash += payout
-                
-                # Create news event
-                project = self.available_projects.get(investment.project_id)
-                if project:
-                    if payout > investment.amount_invested:
-                        news_events.append(f"Project {project.name} succeeded! Payout: ${payout}")
-                    else:
-                        news_events.append(f"Project {project.name} failed. Salvage: ${payout}")
-                
-                completed_investments.append(investment)
+            # Project completed - calculate payout
+            payout = self._calculate_project_payout(investment)
+            
+            # Remove the project asset from ledger
+            ledger.remove_asset("PROJECT", investment.project_id, _ONE)
+            
+            # Add cash payout
+            ledger.cash += payout
+            
+            # Create news event
+            project = self.available_projects.get(investment.project_id)
+            if project:
+                if payout > investment.amount_invested:
+                    news_events.append(f"Project {project.name} succeeded! Payout: ${payout}")
+                else:
+                    news_events.append(f"Project {project.name} failed. Salvage: ${payout}")
+            
+            completed_investments.append(investment)
         
         # Remove completed investments
         for investment in completed_investments:
@@ -242,7 +340,7 @@ class ProjectBackend:
         """Calculate the payout for a completed project. Accepts optional rng for deterministic tests."""
         project = self.available_projects.get(investment.project_id)
         if not project:
-            return Decimal('0.00')
+            return _ZERO
         rng = rng or np.random
 
         # Determine if project succeeded
@@ -250,17 +348,16 @@ class ProjectBackend:
 
         if success_roll < float(project.success_probability):
             # Success - use lognormal distribution
-            mean_return = float(project.expected_return_pct)
             # Use lognormal with mean and some variance
-            multiplier = rng.lognormal(mean=np.log(1 + mean_return), sigma=0.2)
+            multiplier = rng.lognormal(mean=_lognormal_mean(project.expected_return_pct), sigma=0.2)
             payout = investment.amount_invested * Decimal(str(multiplier))
         else:
             # Failure - use uniform distribution for salvage value (10-30% of investment)
             salvage_pct = rng.uniform(0.1, 0.3)
             payout = investment.amount_invested * Decimal(str(salvage_pct))
 
-        return payout.quantize(Decimal('0.01'))
-        
+        return payout.quantize(_CENT)
+
     def get_agent_investments(self) -> List[ProjectInvestment]:
         """Get list of agent's current investments."""
         return self.agent_investments.copy()
@@ -270,7 +367,7 @@ class Bond:
     """Represents a bond with pricing information."""
     def __init__(self, bond_id: str, name: str, face_value: Decimal, coupon_rate: Decimal,
                  maturity_years: int, current_price: Decimal):
-        self.bond_id = bond_id
+        self.bond_id = sys.intern(bond_id)
         self.name = name
         self.face_value = face_value
         self.coupon_rate = coupon_rate
@@ -281,7 +378,7 @@ class Bond:
     def _calculate_ytm(self) -> Decimal:
         """Calculate approximate yield to maturity."""
         if self.current_price == 0:
-            return Decimal('0.00')
+            return _ZERO
         annual_coupon = self.face_value * self.coupon_rate
         ytm = (annual_coupon + (self.face_value - self.current_price) / self.maturity_years) / self.current_price
         return ytm.quantize(Decimal('0.0001'))
@@ -298,6 +395,8 @@ class DebtBackend:
         # Load market configuration for base interest rate
         market_config = config_loader.load_market_config()
         self.base_interest_rate = Decimal(market_config['base_interest_rate'])
+        # Bumped whenever bond prices are recalculated, like TradeBackend.price_version
+        self.price_version = 0
         
         self._initialize_sample_bonds(config_loader)
         
@@ -320,6 +419,11 @@ class DebtBackend:
         """Get current price of a bond."""
         bond = self.bonds.get(bond_id)
         return bond.current_price if bond else None
+
+    def get_bond_prices(self, bond_ids: List[str]) -> Dict[str, Optional[Decimal]]:
+        """Get current prices for several bonds in one call."""
+        bonds = self.bonds
+        return {bond_id: bonds[bond_id].current_price if bond_id in bonds else None for bond_id in bond_ids}
         
     def execute_allocation(self, allocation: BondAlloc, ledger: Ledger) -> bool:
         """Execute a bond allocation (buy or sell)."""
@@ -359,13 +463,7 @@ class DebtBackend:
         bond_units_to_sell = usd_amount / price
         
         # Check if agent has enough bonds
-        existing_asset = None
-        for asset in ledger.assets:
-            if asset.asset_type == "BOND" and asset.identifier == bond_id:
-                existing_asset = asset
-                break
-                
-        if not existing_asset or existing_asset.quantity < bond_units_to_sell:
+        if ledger.holding_quantity_units("BOND", bond_id) < _to_units(bond_units_to_sell):
             return False
             
         # Execute the sale
@@ -393,18 +491,19 @@ class DebtBackend:
                 N = bond.maturity_years
                 price = Decimal('0.0')
                 for t in range(1, N + 1):
-                    price += C / (Decimal('1.0') + r) ** t
-                price += F / (Decimal('1.0') + r) ** N
+                    price += C / (_ONE + r) ** t
+                price += F / (_ONE + r) ** N
 
                 # Ensure price doesn't go below 10% of face value or above 200% of face value
                 min_price = bond.face_value * Decimal('0.1')
                 max_price = bond.face_value * Decimal('2.0')
-                bond.current_price = max(min_price, min(max_price, price)).quantize(Decimal('0.01'))
+                bond.current_price = max(min_price, min(max_price, price)).quantize(_CENT)
             except Exception as e:
                 print(f"Error calculating bond price for {bond.bond_id}: {e}")
 
             # Recalculate yield to maturity
             bond.yield_to_maturity = bond._calculate_ytm()
+        self.price_version += 1
             
     def get_all_bonds(self) -> List[Bond]:
         """Get list of all available bonds."""
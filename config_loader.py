@@ -1,9 +1,29 @@
+import copy
 import json
 import os
 from decimal import Decimal
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+# Parsed config files keyed on (resolved path, mtime, size), shared by all loaders
+_JSON_CACHE: Dict[tuple, Any] = {}
+
+
+def _load_json(config_file: Path) -> Any:
+    """Parse a JSON config file, reusing the parsed result while the file is unchanged.
+
+    Returns a deep copy so callers can modify it without touching the cache.
+    """
+    stat = config_file.stat()
+    key = (str(config_file.resolve()), stat.st_mtime_ns, stat.st_size)
+    data = _JSON_CACHE.get(key)
+    if data is None:
+        with open(config_file, 'r') as f:
+            data = json.load(f)
+        _JSON_CACHE[key] = data
+    return copy.deepcopy(data)
+
+
 class ConfigLoader:
     """Handles loading configuration files with fallback to default values."""
     
@@ -25,9 +45,8 @@ class ConfigLoader:
         
         try:
             if config_file.exists():
-                with open(config_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get('stocks', default_stocks)
+                data = _load_json(config_file)
+                return data.get('stocks', default_stocks)
             else:
                 print(f"Warning: {config_file} not found, using default stock data")
                 return default_stocks
@@ -90,9 +109,8 @@ class ConfigLoader:
         
         try:
             if config_file.exists():
-                with open(config_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get('projects', default_projects)
+                data = _load_json(config_file)
+                return data.get('projects', default_projects)
             else:
                 print(f"Warning: {config_file} not found, using default project data")
                 return default_projects
@@ -150,9 +168,8 @@ class ConfigLoader:
         
         try:
             if config_file.exists():
-                with open(config_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get('bonds', default_bonds)
+                data = _load_json(config_file)
+                return data.get('bonds', default_bonds)
             else:
                 print(f"Warning: {config_file} not found, using default bond data")
                 return default_bonds
@@ -171,9 +188,8 @@ class ConfigLoader:
         
         try:
             if config_file.exists():
-                with open(config_file, 'r') as f:
-                    data = json.load(f)
-                    return data.get('market_parameters', default_market)
+                data = _load_json(config_file)
+                return data.get('market_parameters', default_market)
             else:
                 print(f"Warning: {config_file} not found, using default market parameters")
                 return default_market
@@ -0,0 +1,30 @@
+"""Shared pytest configuration.
+
+Backends, ledgers and engines are built per test (templates are deep-copied
+before use), so the only state shared between tests is the global
+visualization event collector. It is cleared after every test so tests stay
+independent (and safe to spread across workers with ``pytest -n auto`` when
+pytest-xdist is installed).
+"""
+
+import sys
+
+import pytest
+
+from backends import ProjectBackend
+
+
+@pytest.fixture(scope="session")
+def project_backend_template():
+    """ProjectBackend built once per session (and worker); deep-copy before mutating."""
+    return ProjectBackend()
+
+
+@pytest.fixture(autouse=True)
+def _clear_event_collector():
+    """Drop events emitted by the previous test from the global collector."""
+    yield
+    # Only touch the collector if some test already imported it
+    events_module = sys.modules.get('visualization.events')
+    if events_module is not None:
+        events_module.event_collector.clear_events()
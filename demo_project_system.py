@@ -88,7 +88,7 @@ def main():
                 print(f"  📰 {news.description}")
         
         # Show portfolio changes
-        project_holdings = [h for h in obs.portfolio if h.asset_type == "PROJECT"]
+        project_holdings = obs.project_holdings
         if week % 4 == 0 or obs.news:  # Show status every 4 weeks or when there's news
             print(f"\nWeek {week} Status:")
             print(f"  Cash: ${obs.cash:,.2f}")
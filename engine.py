@@ -1,18 +1,66 @@
 import numpy as np
 import random
 from collections import deque
+from datetime import datetime
 from decimal import Decimal
-from typing import Deque, Optional, Tuple, Dict
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 from enum import Enum
+from itertools import chain
 import pandas as pd
 
+from hodl_bot import AdaptabilityMeasurer, HODLBot
 from ledger import Ledger
+from router import AllocationManager
 from models import CapitalAllocationAction, InfoDict, Observation, NewsEvent
 from visualization import event_collector, EventType
 from market_data.engine import MarketDataEngine
 
 
+def _returns_std(nav_history: Sequence[Decimal], current_nav: float) -> float:
+    """Population standard deviation of the period returns over nav_history + [current_nav].
+
+    The history holds at most a few NAVs, so a single Welford pass in plain
+    Python beats building NumPy temporaries for np.diff/np.std.
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    previous = None
+    for nav in chain(map(float, nav_history), (current_nav,)):
+        if previous is not None:
+            count += 1
+            ret = (nav - previous) / previous
+            delta = ret - mean
+            mean += delta / count
+            m2 += delta * (ret - mean)
+        previous = nav
+    return (m2 / count) ** 0.5 if count else 0.0
+
+
+class _DecimalParam:
+    """Decimal engine parameter that also keeps a float copy (``_<name>_f``) for the reward arithmetic."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.float_name = f'_{name}_f'
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__dict__[self.name]
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+        obj.__dict__[self.float_name] = float(value)
+
+
 class SimulationEngine:
+    # Reward coefficients; reassigning one refreshes its float copy
+    risk_free_rate = _DecimalParam()
+    target_volatility = _DecimalParam()
+    lambda_vol = _DecimalParam()
+    kappa_cost = _DecimalParam()
+
     def __init__(self, ledger: Ledger, allocation_manager=None, enable_hodl_comparison: bool = False, market_data_engine: Optional[MarketDataEngine] = None):
         """Initialize the simulation with starting conditions."""
         self.current_tick = 0
@@ -75,14 +123,47 @@ class SimulationEngine:
 
     def tick(self, action: Optional[CapitalAllocationAction] = None) -> Tuple[Observation, Decimal, bool, bool, InfoDict]:
         """Main simulation step with HODL comparison."""
-        # Run main simulation
-        obs, reward, terminated, truncated, info = self._tick_main(action)
-        
-        # Run HODL bot simulation if enabled
-        if self.enable_hodl_comparison and self.hodl_engine:
-            self._tick_hodl_bot(obs)
+        # Every event of this tick (and of the nested HODL tick) shares one timestamp
+        owns_tick_time = event_collector.tick_time is None
+        if owns_tick_time:
+            event_collector.set_tick_time(datetime.now())
+        try:
+            # Run main simulation
+            obs, reward, terminated, truncated, info = self._tick_main(action)
+            
+            # Run HODL bot simulation if enabled
+            if self.enable_hodl_comparison and self.hodl_engine:
+                self._tick_hodl_bot(obs)
+        finally:
+            if owns_tick_time:
+                event_collector.set_tick_time(None)
             
         return obs, reward, terminated, truncated, info
+
+    def run(self, n_ticks: int, actions: Optional[Sequence[Optional[CapitalAllocationAction]]] = None) -> List[Tuple[Observation, Decimal, bool, bool, InfoDict]]:
+        """
+        Run up to n_ticks ticks, passing actions[i] on the i-th tick (None for no action).
+        Stops early once an episode terminates or truncates. Returns the tick results in order.
+        """
+        if actions is None:
+            actions = [None] * n_ticks
+        tick = self.tick
+        results = []
+        for action in actions[:n_ticks]:
+            result = tick(action)
+            results.append(result)
+            if result[2] or result[3]:
+                break
+        return results
+        
+    def run_ticks(self, n_ticks: int) -> Tuple[Optional[Observation], List[NewsEvent]]:
+        """
+        Advance up to n_ticks ticks without actions (see run()).
+        Returns the final observation (None if no tick ran) and every news event emitted on the way.
+        """
+        results = self.run(n_ticks)
+        news = [event for obs, *_ in results for event in obs.news]
+        return (results[-1][0] if results else None), news
         
     def _tick_main(self, action: Optional[CapitalAllocationAction] = None) -> Tuple[Observation, Decimal, bool, bool, InfoDict]:
         """Main simulation tick (existing tick logic)."""
@@ -132,7 +213,7 @@ class SimulationEngine:
                 EventType.AGENT_DECISION,
                 tick=self.current_tick,
                 data={
-                    'action': action.dict() if hasattr(action, 'dict') else str(action),
+                    'action': action.model_dump(mode='json') if hasattr(action, 'model_dump') else str(action),
                     'comment': getattr(action, 'comment', ''),
                     'cognition_cost': str(getattr(action, 'cognition_cost', 0)),
                     'num_allocations': len(getattr(action, 'allocations', []))
@@ -181,7 +262,7 @@ class SimulationEngine:
             data={
                 'nav': str(obs.nav),
                 'cash': str(obs.cash),
-                'portfolio': [holding.dict() if hasattr(holding, 'dict') else str(holding) for holding in obs.portfolio],
+                'portfolio': [holding.model_dump(mode='json') if hasattr(holding, 'model_dump') else str(holding) for holding in obs.portfolio],
                 'num_holdings': len(obs.portfolio)
             }
         )
@@ -199,17 +280,18 @@ class SimulationEngine:
         
         # Record shock for adaptability measurement
         if self.enable_hodl_comparison and self.adaptability_measurer:
+            # HODL NAV is read once and shared by shock recording and tracking
+            hodl_nav = self.hodl_engine.ledger.get_nav() if self.hodl_engine else obs.nav
+
             # Find if a shock-like event happened to record for adaptability
             shock_event = next((event for event in news_events if event.event_type == "ECONOMIC_DATA"), None)
             if shock_event:
-                hodl_nav = self.hodl_engine.ledger.get_nav() if self.hodl_engine else obs.nav
                 self.adaptability_measurer.record_shock(
                     self.current_tick, shock_event.event_type, obs.nav, hodl_nav
                 )
         
         # Update adaptability measurement
         if self.enable_hodl_comparison and self.adaptability_measurer:
-            hodl_nav = self.hodl_engine.ledger.get_nav() if self.hodl_engine else obs.nav
             self.adaptability_measurer.update_post_shock_performance(
                 self.current_tick, obs.nav, hodl_nav
             )
@@ -244,65 +326,55 @@ class SimulationEngine:
        """
        Calculate reward using the formula:
        reward_t = ΔNAV_adj_t – λ·excess_vol_t – κ_cost·token_usd_t – κ_mem·memory_usd_t
+
+       The arithmetic runs on floats; only the final reward is converted back
+       to Decimal (rounded to 8 places).
        """
        current_nav = self.ledger.get_nav()
+       current = float(current_nav)
        
        # Calculate ΔNAV_adj_t (NAV change adjusted for risk-free rate)
        if len(self.nav_history) > 0:
-           previous_nav = self.nav_history[-1]
-           nav_change = current_nav - previous_nav
+           previous = float(self.nav_history[-1])
+           nav_change = current - previous
            
            # Adjust for risk-free rate (what the agent "should" have earned)
-           expected_return = previous_nav * self.risk_free_rate
+           expected_return = previous * self._risk_free_rate_f
            delta_nav_adj = nav_change - expected_return
        else:
            # First tick - no previous NAV to compare
-           delta_nav_adj = Decimal('0.00')
+           delta_nav_adj = 0.0
        
        # Calculate excess volatility penalty
-       excess_vol_penalty = self._calculate_volatility_penalty(current_nav)
+       excess_vol_penalty = self._calculate_volatility_penalty(current)
        
        # Calculate cognition cost
-       cognition_cost = Decimal('0.00')
+       cognition_cost = 0.0
        if action:
-           cognition_cost = self.kappa_cost * action.cognition_cost
+           cognition_cost = self._kappa_cost_f * float(action.cognition_cost)
        
        # Memory cost (placeholder for now)
-       memory_cost = Decimal('0.00')
+       memory_cost = 0.0
        
        # Final reward calculation
-       reward = delta_nav_adj - (self.lambda_vol * excess_vol_penalty) - cognition_cost - memory_cost
+       reward = delta_nav_adj - (self._lambda_vol_f * excess_vol_penalty) - cognition_cost - memory_cost
        
        # Update NAV history
        self.nav_history.append(current_nav)
        
-       return reward
+       return Decimal(str(round(reward, 8)))
 
-    def _calculate_volatility_penalty(self, current_nav: Decimal) -> Decimal:
+    def _calculate_volatility_penalty(self, current_nav: float) -> float:
        """Calculate excess volatility penalty."""
-       if len(self.nav_history) < 2:
-           return Decimal('0.00')
-       
-       # Convert to numpy array for volatility calculation
-       nav_values = [float(nav) for nav in list(self.nav_history) + [current_nav]]
-       nav_array = np.array(nav_values)
+       n = len(self.nav_history)
+       if n < 2:
+           return 0.0
        
-       # Calculate returns
-       if len(nav_array) < 2:
-           return Decimal('0.00')
-       
-       returns = np.diff(nav_array) / nav_array[:-1]
-       
-       # Calculate volatility (standard deviation of returns)
-       if len(returns) < 2:
-           return Decimal('0.00')
-       
-       volatility = Decimal(str(np.std(returns)))
+       # Volatility is the standard deviation of returns
+       volatility = _returns_std(self.nav_history, current_nav)
        
        # Calculate excess volatility above target
-       excess_volatility = max(Decimal('0.00'), volatility - self.target_volatility)
-       
-       return excess_volatility
+       return max(0.0, volatility - self._target_volatility_f)
 
     def reset(self, initial_cash: Decimal = Decimal('100000.00')) -> Observation:
         """Reset the simulation to initial state."""
@@ -323,15 +395,26 @@ class SimulationEngine:
 
         
     def _tick_hodl_bot(self, main_obs: Observation):
-        """Run HODL bot simulation tick."""
+        """Run HODL bot simulation tick.
+
+        Runs inline rather than in a worker: the HODL engine shares the trade,
+        project and debt backends with the main engine, and the next main tick
+        reads the HODL ledger's NAV, so the two cannot overlap.
+        """
         if not self.hodl_bot or not self.hodl_engine:
             return
             
         # Get HODL bot action
         hodl_action = self.hodl_bot.get_action(main_obs)
         
-        # Run HODL engine tick
-        self.hodl_engine.tick(hodl_action)
+        # Run HODL engine tick (every tick, so its tick count, NAV history and
+        # events stay in step with the main engine). Its events are tagged so
+        # consumers can tell them from the agent's.
+        event_collector.set_source("hodl")
+        try:
+            self.hodl_engine.tick(hodl_action)
+        finally:
+            event_collector.set_source(None)
         
     def get_adaptability_report(self) -> Dict:
         """Get comprehensive adaptability report."""
@@ -122,6 +122,11 @@ class AgentTycoonEnv(gym.Env):
             
             def get_bond_price(self, identifier: str) -> Optional[Decimal]:
                 return self.debt_backend.get_bond_price(identifier)
+
+            @property
+            def price_version(self) -> int:
+                # Both counters only grow, so their sum changes whenever either does
+                return self.trade_backend.price_version + self.debt_backend.price_version
         
         return PriceProvider(self.trade_backend, self.debt_backend)
         
@@ -226,13 +231,12 @@ class AgentTycoonEnv(gym.Env):
         num_bonds = NUM_BONDS
         max_portfolio_assets = num_stocks + num_projects + num_bonds
         portfolio_values = np.zeros(max_portfolio_assets, dtype=np.float32)
-        for i, holding in enumerate(obs.portfolio[:max_portfolio_assets]):
-            portfolio_values[i] = float(holding.current_value)
+        # obs.portfolio was built from this ledger at the end of the tick, so
+        # read the same values straight off it as one array
+        holding_values = self.ledger.get_holding_values()[:max_portfolio_assets]
+        portfolio_values[:len(holding_values)] = holding_values
 
-        stock_prices = np.zeros(num_stocks, dtype=np.float32)
-        for i, ticker in enumerate(list(self.trade_backend.stocks.keys())[:num_stocks]):
-            price = self.trade_backend.get_price(ticker)
-            stock_prices[i] = float(price) if price else 0.0
+        stock_prices = self.trade_backend.get_price_array().astype(np.float32)
 
         num_project_features = 3
         project_info = np.zeros(num_projects * num_project_features, dtype=np.float32)
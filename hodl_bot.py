@@ -5,6 +5,9 @@ from copy import deepcopy
 from models import CapitalAllocationAction, Observation, EquityAlloc
 
 
+# News event types that make the HODL bot freeze its portfolio
+SHOCK_EVENT_TYPES = ("RATE_SHOCK", "MARKET_VOLATILITY")
+
 class HODLBot:
     """
     HODL (Hold On for Dear Life) Bot - A baseline strategy that freezes
@@ -20,10 +23,10 @@ class HODLBot:
     def should_hodl(self, observation: Observation) -> bool:
         """Determine if bot should start HODLing based on news events."""
         for event in observation.news:
-            if event.event_type in ["RATE_SHOCK", "MARKET_VOLATILITY"]:
+            if event.event_type in SHOCK_EVENT_TYPES:
                 return True
         return False
-        
+
     def get_action(self, observation: Observation) -> Optional[CapitalAllocationAction]:
         """
         Get HODL bot action. Returns None (no action) when HODLing,
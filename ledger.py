@@ -1,53 +1,123 @@
+import sys
 from decimal import Decimal
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from models import AssetHolding
 
+# Fixed-point scale for internal amounts: 1 unit == 1e-8 of a dollar/share
+_UNIT = 10**8
+
+# Decimal constants used on every valuation, parsed once
+_ZERO = Decimal('0.00')
+_CENT = Decimal('0.01')
+_MICRO = Decimal('0.000001')
+
+
+def _to_units(value: Decimal) -> int:
+    """Convert a Decimal amount to integer units (rounded half-even)."""
+    return int((Decimal(value) * _UNIT).to_integral_value())
+
+
+def _from_units(units: int) -> Decimal:
+    """Convert integer units back to a Decimal amount."""
+    return Decimal(units).scaleb(-8)
+
 
 class Asset:
-    """Represents a single asset holding."""
+    """Represents a single asset holding.
+
+    Quantity and cost basis are read-only: only the owning Ledger changes them
+    (in add_asset/remove_asset), so its cached valuations stay valid.
+    """
     def __init__(self, asset_type: str, identifier: str, quantity: Decimal, cost_basis: Decimal):
-        self.asset_type = asset_type
-        self.identifier = identifier
-        self.quantity = quantity
-        self.cost_basis = cost_basis  # Total cost when acquired
+        # Interned so type checks and index lookups hit the identity fast path
+        self.asset_type = sys.intern(asset_type)
+        self.identifier = sys.intern(identifier)
+        self._quantity_u = _to_units(quantity)
+        self._cost_basis_u = _to_units(cost_basis)  # Total cost when acquired
+
+    @property
+    def quantity_u(self) -> int:
+        return self._quantity_u
+
+    @property
+    def cost_basis_u(self) -> int:
+        return self._cost_basis_u
+
+    @property
+    def quantity(self) -> Decimal:
+        return _from_units(self._quantity_u)
+
+    @property
+    def cost_basis(self) -> Decimal:
+        return _from_units(self._cost_basis_u)
+
 
 class Ledger:
     """Manages the agent's financial state and portfolio."""
 
     def __init__(self, initial_cash: Decimal, price_provider: Optional[object] = None):
-        self._cash = initial_cash
-        self.assets: List[Asset] = []
-        self.price_provider = price_provider
+        self._cash_u = _to_units(initial_cash)
+        # Mutated only by add_asset/remove_asset, which keep the index and
+        # versions below in step; exposed read-only as `assets`
+        self._assets: List[Asset] = []
+        # (asset_type, identifier) -> holding in self._assets, for O(1) lookups
+        self._asset_index: Dict[Tuple[str, str], Asset] = {}
+        self._price_provider = price_provider
+        # Bumped on every holdings mutation (not on cash changes); together with
+        # the provider's price_version it keys the cached portfolio valuation
+        self._holdings_version = 0
+        self._asset_value_cache: Optional[Tuple[Tuple[int, int], int]] = None
+        self._holdings_cache: Optional[Tuple[Tuple[int, int], Tuple[AssetHolding, ...]]] = None
     
+    @property
+    def price_provider(self) -> Optional[object]:
+        return self._price_provider
+
+    @price_provider.setter
+    def price_provider(self, provider: Optional[object]) -> None:
+        # Cached valuations are keyed on the old provider's price_version
+        self._price_provider = provider
+        self._asset_value_cache = None
+        self._holdings_cache = None
+
+    @property
+    def assets(self) -> Tuple[Asset, ...]:
+        """Current holdings (read-only snapshot)."""
+        return tuple(self._assets)
+
     @property
     def cash(self) -> Decimal:
         """Get cash with proper quantization to 2 decimal places."""
-        return self._cash.quantize(Decimal('0.01'))
+        return _from_units(self._cash_u).quantize(_CENT)
     
     @cash.setter
     def cash(self, value: Decimal) -> None:
         """Set cash with proper quantization to 2 decimal places."""
-        self._cash = value.quantize(Decimal('0.01'))
+        self._cash_u = _to_units(value.quantize(_CENT))
 
     def add_asset(self, asset_type: str, identifier: str, quantity: Decimal, total_cost: Decimal) -> bool:
         """Add an asset to the portfolio. Returns True if successful."""
-        if total_cost > self.cash:
+        cost_u = _to_units(total_cost)
+        if cost_u > self._cash_u:
             return False
 
-        self._cash -= total_cost
+        self._cash_u -= cost_u
+        self._holdings_version += 1
 
         # Check if we already own this asset
         existing_asset = self._find_asset(asset_type, identifier)
         if existing_asset:
             # Update existing holding (consolidate investments in the same asset/project)
-            total_quantity = existing_asset.quantity + quantity
-            total_cost_basis = existing_asset.cost_basis + total_cost
-            existing_asset.quantity = total_quantity
-            existing_asset.cost_basis = total_cost_basis
+            existing_asset._quantity_u += _to_units(quantity)
+            existing_asset._cost_basis_u += cost_u
         else:
             # Add new asset
-            self.assets.append(Asset(asset_type, identifier, quantity, total_cost))
+            asset = Asset(asset_type, identifier, quantity, total_cost)
+            self._assets.append(asset)
+            self._asset_index[(asset_type, identifier)] = asset
 
         return True
 
@@ -57,83 +127,153 @@ class Ledger:
         Uses price_provider to get market value.
         """
         asset = self._find_asset(asset_type, identifier)
-        if not asset or asset.quantity < quantity:
-            return False, Decimal('0.00')
+        quantity_u = _to_units(quantity)
+        if not asset or asset.quantity_u < quantity_u:
+            return False, _ZERO
 
         # Get market price
-        price_per_unit = asset.cost_basis / asset.quantity if asset.quantity > 0 else Decimal('0')
-        if self.price_provider and asset_type == "EQUITY":
-            market_price = self.price_provider.get_price(identifier)
-            if market_price is not None:
-                price_per_unit = market_price
-        elif self.price_provider and asset_type == "BOND" and hasattr(self.price_provider, 'get_bond_price'):
-            bond_price = self.price_provider.get_bond_price(identifier)
-            if bond_price is not None:
-                price_per_unit = bond_price
-        
-        proceeds = price_per_unit * quantity
+        price_u = self._price_units(asset)
+        if price_u is None:
+            price_u = asset.cost_basis_u * _UNIT // asset.quantity_u if asset.quantity_u > 0 else 0
+
+        proceeds_u = quantity_u * price_u // _UNIT
 
         # Update asset quantity and cost basis proportionally
-        cost_basis_per_unit = asset.cost_basis / asset.quantity
-        asset.quantity -= quantity
-        asset.cost_basis -= cost_basis_per_unit * quantity
+        asset._cost_basis_u -= asset.cost_basis_u * quantity_u // asset.quantity_u
+        asset._quantity_u -= quantity_u
 
         # Remove asset if quantity is zero
-        if asset.quantity <= Decimal('0.000001'):
-            self.assets.remove(asset)
+        if asset.quantity <= _MICRO:
+            self._assets.remove(asset)
+            del self._asset_index[(asset_type, identifier)]
 
         # Add proceeds to cash
-        self._cash += proceeds
+        self._cash_u += proceeds_u
+        self._holdings_version += 1
+
+        return True, _from_units(proceeds_u)
 
-        return True, proceeds
+    def holding_quantity_units(self, asset_type: str, identifier: str) -> int:
+        """Quantity held of an asset in integer units (0 if not held)."""
+        asset = self._find_asset(asset_type, identifier)
+        return asset.quantity_u if asset else 0
 
     def get_nav(self) -> Decimal:
-        """Calculate Net Asset Value (cash + market value of all assets). Skips assets with missing prices."""
+        """Calculate Net Asset Value (cash + market value of all assets). Skips assets with missing prices.
+
+        The market value of the holdings is memoized when the price provider
+        exposes a ``price_version`` counter; it is reused until the holdings or
+        the prices change, so cash-only changes just re-add the cash balance.
+        """
         import warnings
-        asset_value = Decimal('0.00')
-        for asset in self.assets:
-            if self.price_provider and asset.asset_type == "EQUITY":
-                market_price = self.price_provider.get_price(asset.identifier)
-                if market_price is not None:
-                    asset_value += asset.quantity * market_price
-                else:
-                    warnings.warn(f"Missing market price for equity {asset.identifier}; excluded from NAV.", UserWarning)
-            elif self.price_provider and asset.asset_type == "BOND" and hasattr(self.price_provider, 'get_bond_price'):
-                bond_price = self.price_provider.get_bond_price(asset.identifier)
-                if bond_price is not None:
-                    asset_value += asset.quantity * bond_price
-                else:
-                    warnings.warn(f"Missing market price for bond {asset.identifier}; excluded from NAV.", UserWarning)
+        price_version = getattr(self._price_provider, 'price_version', None)
+        if price_version is not None:
+            cache_key = (self._holdings_version, price_version)
+            if self._asset_value_cache is not None and self._asset_value_cache[0] == cache_key:
+                return (self.cash + _from_units(self._asset_value_cache[1])).quantize(_CENT)
+
+        asset_value_u = 0
+        for asset, value_u in zip(self._assets, self._market_values_u()):
+            if value_u is not None:
+                asset_value_u += value_u
+            elif self._price_provider and asset.asset_type == "EQUITY":
+                warnings.warn(f"Missing market price for equity {asset.identifier}; excluded from NAV.", UserWarning)
+            elif self._price_provider and asset.asset_type == "BOND" and hasattr(self._price_provider, 'get_bond_price'):
+                warnings.warn(f"Missing market price for bond {asset.identifier}; excluded from NAV.", UserWarning)
             else:
                 warnings.warn(f"Unknown asset type or missing price provider for {asset.identifier}; excluded from NAV.", UserWarning)
-        return (self.cash + asset_value).quantize(Decimal('0.01'))
+        if price_version is not None:
+            self._asset_value_cache = (cache_key, asset_value_u)
+        return (self.cash + _from_units(asset_value_u)).quantize(_CENT)
 
     def get_portfolio_holdings(self) -> List[AssetHolding]:
-        """Return current portfolio as list of AssetHolding objects."""
+        """Return current portfolio as list of AssetHolding objects.
+
+        Like get_nav, the snapshot is reused while neither the holdings nor the
+        provider's ``price_version`` has changed; each call returns a new list.
+        """
+        price_version = getattr(self._price_provider, 'price_version', None)
+        if price_version is not None:
+            cache_key = (self._holdings_version, price_version)
+            if self._holdings_cache is not None and self._holdings_cache[0] == cache_key:
+                return list(self._holdings_cache[1])
+
         holdings = []
-        for asset in self.assets:
-            current_value = asset.cost_basis
-            if self.price_provider and asset.asset_type == "EQUITY":
-                market_price = self.price_provider.get_price(asset.identifier)
-                if market_price is not None:
-                    current_value = (asset.quantity * market_price).quantize(Decimal('0.01'))
-            elif self.price_provider and asset.asset_type == "BOND" and hasattr(self.price_provider, 'get_bond_price'):
-                bond_price = self.price_provider.get_bond_price(asset.identifier)
-                if bond_price is not None:
-                    current_value = (asset.quantity * bond_price).quantize(Decimal('0.01'))
-            
+        for asset, value_u in zip(self._assets, self._market_values_u()):
+            current_value = _from_units(value_u) if value_u is not None else asset.cost_basis
+
             holding = AssetHolding(
                 asset_type=asset.asset_type,
                 identifier=asset.identifier,
-                quantity=asset.quantity.quantize(Decimal('0.000001')),
-                current_value=current_value.quantize(Decimal('0.01'))
+                quantity=asset.quantity.quantize(_MICRO),
+                current_value=current_value.quantize(_CENT)
             )
             holdings.append(holding)
+        if price_version is not None:
+            self._holdings_cache = (cache_key, tuple(holdings))
         return holdings
 
+    def get_holding_values(self) -> np.ndarray:
+        """Return the current value of every holding, in portfolio order, as a float64 array.
+
+        Same valuation as get_portfolio_holdings (market value, else cost basis)
+        without materializing AssetHolding models, for numeric consumers.
+        """
+        values = np.fromiter(
+            (value_u if value_u is not None else asset.cost_basis_u
+             for asset, value_u in zip(self._assets, self._market_values_u())),
+            dtype=np.float64,
+            count=len(self._assets)
+        )
+        return values / _UNIT
+
+    def _market_values_u(self) -> List[Optional[int]]:
+        """Market value of every asset in integer units (None where unpriced), in one pass."""
+        provider = self._price_provider
+        if not provider:
+            return [None] * len(self._assets)
+
+        # Resolve the provider's pricing methods once rather than per asset
+        get_price_units = getattr(provider, 'get_price_units', None)
+        get_price = getattr(provider, 'get_price', None)
+        get_bond_price = getattr(provider, 'get_bond_price', None)
+
+        # Batch lookups, where offered, replace the per-identifier calls
+        get_prices = getattr(provider, 'get_prices', None)
+        if get_price_units is None and get_prices is not None:
+            get_price = get_prices([a.identifier for a in self._assets if a.asset_type == "EQUITY"]).get
+        get_bond_prices = getattr(provider, 'get_bond_prices', None)
+        if get_bond_prices is not None:
+            get_bond_price = get_bond_prices([a.identifier for a in self._assets if a.asset_type == "BOND"]).get
+
+        values: List[Optional[int]] = []
+        for asset in self._assets:
+            if asset.asset_type == "EQUITY" and get_price_units is not None:
+                price_u = get_price_units(asset.identifier)
+            elif asset.asset_type == "EQUITY" and get_price is not None:
+                price = get_price(asset.identifier)
+                price_u = _to_units(price) if price is not None else None
+            elif asset.asset_type == "BOND" and get_bond_price is not None:
+                price = get_bond_price(asset.identifier)
+                price_u = _to_units(price) if price is not None else None
+            else:
+                price_u = None
+            values.append(asset.quantity_u * price_u // _UNIT if price_u is not None else None)
+        return values
+
+    def _price_units(self, asset: Asset) -> Optional[int]:
+        """Market price of an asset in integer units, or None if unavailable."""
+        if self._price_provider and asset.asset_type == "EQUITY":
+            get_price_units = getattr(self._price_provider, 'get_price_units', None)
+            if get_price_units is not None:
+                return get_price_units(asset.identifier)
+            market_price = self._price_provider.get_price(asset.identifier)
+        elif self._price_provider and asset.asset_type == "BOND" and hasattr(self._price_provider, 'get_bond_price'):
+            market_price = self._price_provider.get_bond_price(asset.identifier)
+        else:
+            return None
+        return _to_units(market_price) if market_price is not None else None
+
     def _find_asset(self, asset_type: str, identifier: str) -> Optional[Asset]:
         """Find an asset in the portfolio."""
-        for asset in self.assets:
-            if asset.asset_type == asset_type and asset.identifier == identifier:
-                return asset
-        return None
\ No newline at end of file
+        return self._asset_index.get((asset_type, identifier))
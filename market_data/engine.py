@@ -1,5 +1,6 @@
 from .fetcher import DataFetcher
 from .modeler import FinancialModeler
+import copy
 import pandas as pd
 from typing import Dict, Optional
 
@@ -13,6 +14,14 @@ class MarketDataEngine:
         self.fetcher = DataFetcher(fred_api_key=fred_api_key)
         self.modeler = FinancialModeler()
         self.data = self._load_initial_data()
+        # Market updates per date, valid for the fetcher and modeler that built them
+        self._update_cache: Dict[pd.Timestamp, Dict] = {}
+        self._update_cache_sources = (self.fetcher, self.modeler)
+
+    def clear_cache(self) -> None:
+        """Forget memoized market updates, e.g. after changing what the fetcher returns."""
+        self._update_cache = {}
+        self._update_cache_sources = (self.fetcher, self.modeler)
 
     def _load_initial_data(self) -> Dict[str, pd.DataFrame]:
         """
@@ -36,7 +45,15 @@ class MarketDataEngine:
         Fetch and process market data for the current simulation tick.
         For each tick, fetch new prices and economic data, and process with FinancialModeler.
         Output is structured for easy consumption by the simulation engine.
+        Updates are memoized per date until clear_cache() is called or the
+        fetcher or modeler is replaced; each call returns its own copy.
         """
+        if self._update_cache_sources[0] is not self.fetcher or self._update_cache_sources[1] is not self.modeler:
+            self.clear_cache()
+        cached = self._update_cache.get(current_date)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
         update = {"prices": {}, "economic": {}, "modeling": {}}
 
         # Parameters
@@ -81,4 +98,5 @@ class MarketDataEngine:
 
         update["modeling"] = modeling
 
-        return update
\ No newline at end of file
+        self._update_cache[current_date] = update
+        return copy.deepcopy(update)
\ No newline at end of file
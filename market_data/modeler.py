@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-from arch import arch_model
 from typing import Optional
 
 class FinancialModeler:
@@ -13,11 +12,18 @@ class FinancialModeler:
         """
         if returns.empty:
             return None
+        # arch is slow to import; load it on first use rather than with the engine
+        from arch import arch_model
         try:
             model = arch_model(returns, vol='Garch', p=1, q=1)
             results = model.fit(disp='off')
-            forecast = results.forecast(horizon=1)
-            return np.sqrt(forecast.variance.iloc[-1, 0])
+            # One step of the GARCH(1,1) variance recursion from the last
+            # fitted state; same value as results.forecast(horizon=1)
+            params = results.params
+            last_resid = results.resid.to_numpy()[-1]
+            last_sigma = results.conditional_volatility.to_numpy()[-1]
+            variance = params['omega'] + params['alpha[1]'] * last_resid ** 2 + params['beta[1]'] * last_sigma ** 2
+            return float(np.sqrt(variance))
         except Exception as e:
             print(f"Error calculating GARCH forecast: {e}")
             return None
@@ -29,7 +35,12 @@ class FinancialModeler:
         if returns_df.empty:
             return None
         try:
-            return returns_df.corr()
+            values = returns_df.to_numpy(dtype=np.float64, copy=False)
+            if np.isnan(values).any():
+                # pandas handles missing data with pairwise-complete observations
+                return returns_df.corr()
+            corr = np.atleast_2d(np.corrcoef(values, rowvar=False))
+            return pd.DataFrame(corr, index=returns_df.columns, columns=returns_df.columns)
         except Exception as e:
             print(f"Error calculating correlation matrix: {e}")
             return None
\ No newline at end of file
@@ -1,6 +1,7 @@
 """Core Pydantic models for Agent Tycoon simulation."""
 
 from decimal import Decimal
+from functools import cached_property
 from typing import Any, Dict, List, Literal, Union
 
 from pydantic import BaseModel, Field, ValidationError, condecimal
@@ -8,7 +9,7 @@ from typing_extensions import Annotated
 
 
 class EquityAlloc(BaseModel):
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "frozen": True}
     """Allocation for buying or selling equities."""
     asset_type: Literal["EQUITY"]
     ticker: str
@@ -16,7 +17,7 @@ class EquityAlloc(BaseModel):
 
 
 class ProjectAlloc(BaseModel):
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "frozen": True}
     """Allocation for investing in a project."""
     asset_type: Literal["PROJECT"]
     project_id: str
@@ -24,7 +25,7 @@ class ProjectAlloc(BaseModel):
 
 
 class BondAlloc(BaseModel):
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "frozen": True}
     """Allocation for buying or selling bonds."""
     asset_type: Literal["BOND"]
     bond_id: str
@@ -32,7 +33,7 @@ class BondAlloc(BaseModel):
 
 
 class CashAlloc(BaseModel):
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "frozen": True}
     """Allocation for holding cash."""
     asset_type: Literal["CASH"]
     usd: condecimal(decimal_places=2)
@@ -46,7 +47,7 @@ Allocation = Annotated[
 
 
 class CapitalAllocationAction(BaseModel):
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "frozen": True}
     """Action model for an agent to allocate capital."""
     action_type: Literal["ALLOCATE_CAPITAL"]
     comment: str
@@ -55,7 +56,7 @@ class CapitalAllocationAction(BaseModel):
 
 
 class AssetHolding(BaseModel):
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "frozen": True}
     """Represents a holding of a specific asset in the portfolio."""
     asset_type: str
     identifier: str  # ticker, project_id, bond_id, etc.
@@ -64,7 +65,7 @@ class AssetHolding(BaseModel):
 
 
 class ProjectInfo(BaseModel):
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "frozen": True}
     """Information about an available project for investment."""
     project_id: str
     name: str
@@ -75,7 +76,7 @@ class ProjectInfo(BaseModel):
 
 
 class NewsEvent(BaseModel):
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "frozen": True}
     """Represents a news event that can affect the simulation."""
     event_type: str
     description: str
@@ -92,9 +93,32 @@ class Observation(BaseModel):
     projects_available: List[ProjectInfo]
     news: List[NewsEvent]
 
+    @cached_property
+    def portfolio_by_type(self) -> Dict[str, List[AssetHolding]]:
+        """Holdings grouped by asset type, built on first access."""
+        grouped: Dict[str, List[AssetHolding]] = {}
+        for holding in self.portfolio:
+            grouped.setdefault(holding.asset_type, []).append(holding)
+        return grouped
+
+    @property
+    def equity_holdings(self) -> List[AssetHolding]:
+        """Equity holdings, from the cached grouping."""
+        return self.portfolio_by_type.get("EQUITY", [])
+
+    @property
+    def project_holdings(self) -> List[AssetHolding]:
+        """Project holdings, from the cached grouping."""
+        return self.portfolio_by_type.get("PROJECT", [])
+
+    @cached_property
+    def projects_by_id(self) -> Dict[str, ProjectInfo]:
+        """Available projects keyed by project_id, built on first access."""
+        return {project.project_id: project for project in self.projects_available}
+
 
 class FailedAllocation(BaseModel):
-    model_config = {"extra": "forbid"}
+    model_config = {"extra": "forbid", "frozen": True}
     """Represents a failed allocation attempt and the reason."""
     allocation: Allocation
     reason: str
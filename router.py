@@ -6,6 +6,17 @@ from ledger import Ledger
 if False:
     from backends import TradeBackend, ProjectBackend, DebtBackend
 
+# Allocation types accepted in an action
+_ALLOCATION_TYPES = ("EQUITY", "PROJECT", "BOND", "CASH")
+
+# (asset type, backend attribute, skip if backend missing, failure reason, error prefix),
+# in processing order
+_PROCESSING_ORDER = (
+    ("EQUITY", "trade_backend", False, "Trade execution failed", "Trade error"),
+    ("PROJECT", "project_backend", True, "Project investment failed", "Project error"),
+    ("BOND", "debt_backend", True, "Bond transaction failed", "Bond error"),
+)
+
 class AllocationManager:
     """
     Safely processes agent's CapitalAllocationAction by routing to appropriate backends.
@@ -26,77 +37,38 @@ class AllocationManager:
 
         Processing order: Trade -> Project -> Debt (as per spec)
         """
+        # Nothing to route (e.g. a comment-only action)
+        if not action.allocations:
+            return []
+
         failed_allocations = []
 
         # Separate allocations by type for proper sequencing
-        equity_allocs = []
-        project_allocs = []
-        bond_allocs = []
-        cash_allocs = []
-
+        buckets = {asset_type: [] for asset_type in _ALLOCATION_TYPES}
         for allocation in action.allocations:
-            if allocation.asset_type == "EQUITY":
-                equity_allocs.append(allocation)
-            elif allocation.asset_type == "PROJECT":
-                project_allocs.append(allocation)
-            elif allocation.asset_type == "BOND":
-                bond_allocs.append(allocation)
-            elif allocation.asset_type == "CASH":
-                cash_allocs.append(allocation)
-
-        # Process in order: Trade -> Project -> Debt
-        # For now, only implement Trade (EQUITY)
-
-        # Process equity allocations
-        for allocation in equity_allocs:
-            try:
-                success = self.trade_backend.execute_allocation(allocation, self.ledger)
-                if not success:
-                    failed_allocations.append(FailedAllocation(
-                        allocation=allocation,
-                        reason="Trade execution failed"
-                    ))
-            except Exception as e:
-                failed_allocations.append(FailedAllocation(
-                    allocation=allocation,
-                    reason=f"Trade error: {str(e)}"
-                ))
-
-        # Process project allocations
-        if self.project_backend:
-            for allocation in project_allocs:
-                try:
-                    success = self.project_backend.execute_allocation(allocation, self.ledger)
-                    if not success:
-                        failed_allocations.append(FailedAllocation(
-                            allocation=allocation,
-                            reason="Project investment failed"
-                        ))
-                except Exception as e:
-                    failed_allocations.append(FailedAllocation(
-                        allocation=allocation,
-                        reason=f"Project error: {str(e)}"
-                    ))
+            bucket = buckets.get(allocation.asset_type)
+            if bucket is not None:
+                bucket.append(allocation)
 
-        # Process bond allocations
-        if self.debt_backend:
-            for allocation in bond_allocs:
+        # Process in order: Trade -> Project -> Debt. Cash allocations need no
+        # action (cash simply remains in the ledger).
+        ledger = self.ledger
+        for asset_type, backend_attr, optional, failed_reason, error_prefix in _PROCESSING_ORDER:
+            backend = getattr(self, backend_attr)
+            if optional and not backend:
+                continue
+            for allocation in buckets[asset_type]:
                 try:
-                    success = self.debt_backend.execute_allocation(allocation, self.ledger)
+                    success = backend.execute_allocation(allocation, ledger)
                     if not success:
                         failed_allocations.append(FailedAllocation(
                             allocation=allocation,
-                            reason="Bond transaction failed"
+                            reason=failed_reason
                         ))
                 except Exception as e:
                     failed_allocations.append(FailedAllocation(
                         allocation=allocation,
-                        reason=f"Bond error: {str(e)}"
+                        reason=f"{error_prefix}: {str(e)}"
                     ))
 
-        # Process cash_allocs (holding cash is a valid allocation, so just acknowledge)
-        for allocation in cash_allocs:
-            # No action needed; cash remains in ledger
-            pass
-
-        return failed_allocations
\ No newline at end of file
+        return failed_allocations
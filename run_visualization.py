@@ -4,6 +4,7 @@ Runs the web server and provides a simple interface to start simulations.
 """
 
 import asyncio
+import socket
 import uvicorn
 import threading
 import time
@@ -16,6 +17,12 @@ from router import AllocationManager
 from backends import TradeBackend, ProjectBackend, DebtBackend
 from models import CapitalAllocationAction, EquityAlloc, ProjectAlloc
 
+# Send-buffer tuning for server connections: the socket only reports writable
+# once less than SEND_LOWAT bytes are still unsent, so bursty broadcasts wake
+# the event loop less often and keep less data pinned in the kernel
+SEND_LOWAT = 16 * 1024
+SEND_BUFFER = 256 * 1024
+
 
 class VisualizationDemo:
     """Demo class to run simulations with visualization."""
@@ -41,6 +48,11 @@ class VisualizationDemo:
                 
             def get_bond_price(self, identifier: str):
                 return self.debt_backend.get_bond_price(identifier)
+
+            @property
+            def price_version(self) -> int:
+                # Both counters only grow, so their sum changes whenever either does
+                return self.trade_backend.price_version + self.debt_backend.price_version
         
         price_provider = PriceProvider(self.trade_backend, self.debt_backend)
         
@@ -150,8 +162,12 @@ class VisualizationDemo:
         print(f"Total Return: {((obs.nav - Decimal('100000')) / Decimal('100000') * 100):.2f}%")
 
 
-def run_web_server():
-    """Run the FastAPI web server."""
+def run_web_server(ws_compression: bool = True):
+    """Run the FastAPI web server.
+
+    WebSocket frames use permessage-deflate unless ws_compression is False
+    (worth turning off when the dashboard runs on the same host).
+    """
     app = create_visualization_server(event_collector)
 
     @app.on_event("startup")
@@ -160,7 +176,28 @@ def run_web_server():
         loop = asyncio.get_running_loop()
         event_collector.set_loop(loop)
 
-    uvicorn.run(app, host="127.0.0.1", port=8000, log_level="info")
+    # loop="auto" and http="auto" run on uvloop and httptools when they are
+    # installed (see requirements.txt)
+    config = uvicorn.Config(app, host="127.0.0.1", port=8000, log_level="info", loop="auto", http="auto",
+                            ws="websockets", ws_per_message_deflate=ws_compression,
+                            ws_ping_interval=20.0, ws_ping_timeout=20.0)
+    uvicorn.Server(config).run(sockets=[_listen_socket(config.host, config.port)])
+
+
+def _listen_socket(host: str, port: int) -> socket.socket:
+    """Bound server socket whose send-buffer options accepted connections inherit.
+
+    The ASGI app never sees the connection sockets, so the options are set
+    on the listening socket instead.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER)
+    # Only Linux and macOS have TCP_NOTSENT_LOWAT
+    if hasattr(socket, "TCP_NOTSENT_LOWAT"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NOTSENT_LOWAT, SEND_LOWAT)
+    sock.bind((host, port))
+    return sock
 
 
 import argparse
@@ -172,6 +209,7 @@ def main():
     parser.add_argument("--agent", type=str, default="random", choices=["random", "PPO", "SAC"], help="Agent type to use for simulation")
     parser.add_argument("--agent-path", type=str, default="ppo_agent_final.zip", help="Path to trained RL agent model")
     parser.add_argument("--num-ticks", type=int, default=100, help="Number of simulation ticks")
+    parser.add_argument("--no-ws-compression", action="store_true", help="Disable WebSocket permessage-deflate (for same-host dashboards)")
     args = parser.parse_args()
 
     print("=== Agent Tycoon Visualization System ===")
@@ -180,7 +218,9 @@ def main():
     print()
     
     # Start web server in a separate thread
-    server_thread = threading.Thread(target=run_web_server, daemon=True)
+    server_thread = threading.Thread(
+        target=run_web_server, kwargs={"ws_compression": not args.no_ws_compression}, daemon=True
+    )
     server_thread.start()
     
     # Give server time to start
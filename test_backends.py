@@ -25,6 +25,19 @@ def test_get_price_valid_ticker(trade_backend):
     price = trade_backend.get_price('AAPL')
     assert price == Decimal('150.00')
 
+def test_get_prices_batch(trade_backend):
+    """Test batch price lookup matches single lookups."""
+    prices = trade_backend.get_prices(['AAPL', 'INVALID'])
+    assert prices == {'AAPL': Decimal('150.00'), 'INVALID': None}
+
+def test_get_price_array_tracks_updates(trade_backend):
+    """Test the float price array follows stock order and price updates."""
+    tickers = list(trade_backend.stocks)
+    assert trade_backend.get_price_array().tolist() == [float(trade_backend.get_price(t)) for t in tickers]
+
+    trade_backend.update_prices({tickers[0]: Decimal('123.45')})
+    assert trade_backend.get_price_array()[0] == 123.45
+
 def test_get_price_invalid_ticker(trade_backend):
     """Test getting price for invalid ticker returns None."""
     price = trade_backend.get_price('INVALID')
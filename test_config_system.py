@@ -40,7 +40,14 @@ class TestConfigSystem(unittest.TestCase):
         self.assertEqual(len(loaded_stocks), 2)
         self.assertEqual(loaded_stocks["TEST"]["price"], "100.00")
         self.assertEqual(loaded_stocks["DEMO"]["price"], "200.00")
-        
+
+        # Mutating a loaded config must not leak into later loads
+        loaded_stocks["TEST"]["price"] = "1.00"
+        del loaded_stocks["DEMO"]
+        reloaded = ConfigLoader(self.temp_dir).load_stocks_config()
+        self.assertEqual(reloaded["TEST"]["price"], "100.00")
+        self.assertIn("DEMO", reloaded)
+
     def test_stocks_fallback_to_defaults(self):
         """Test fallback to default stocks when config file is missing."""
         # No config file created - should use defaults
@@ -228,7 +228,16 @@ class TestDebtBackend:
         assert backend.base_interest_rate == prev_base_rate
         for bond_id, bond in backend.bonds.items():
             assert bond.current_price == prev_prices[bond_id]
-        
+
+    def test_price_version(self):
+        """Test price_version is bumped only when bond prices are recalculated."""
+        backend = DebtBackend()
+        assert backend.price_version == 0
+        backend.update_interest_rates({})
+        assert backend.price_version == 0
+        backend.update_interest_rates({'interest_rate': 4.5})
+        assert backend.price_version == 1
+
     def test_bond_price_bounds(self):
         """Test bond prices stay within reasonable bounds."""
         backend = DebtBackend()
@@ -6,12 +6,20 @@ from hodl_bot import HODLBot, AdaptabilityMeasurer
 from models import Observation, NewsEvent, CapitalAllocationAction, EquityAlloc
 
 
+# Shared Decimal constants, parsed once at import
+_INITIAL_CASH = Decimal('100000.00')
+_AGENT_NAV_AT_SHOCK = Decimal('95000.00')
+_HODL_NAV_AT_SHOCK = Decimal('98000.00')
+_SHOCK_INCREMENT_A = Decimal(1000)
+_SHOCK_INCREMENT_B = Decimal(500)
+
+
 class TestHODLBot(unittest.TestCase):
     """Test cases for HODLBot implementation."""
     
     def setUp(self):
         """Set up test fixtures."""
-        self.initial_cash = Decimal('100000.00')
+        self.initial_cash = _INITIAL_CASH
         self.hodl_bot = HODLBot(self.initial_cash)
         
     def test_hodl_bot_initialization(self):
@@ -157,7 +165,7 @@ class TestHODLBot(unittest.TestCase):
         from router import AllocationManager
         
         # Set up test environment
-        ledger = Ledger(initial_cash=Decimal('100000.00'))
+        ledger = Ledger(initial_cash=_INITIAL_CASH)
         trade_backend = TradeBackend()
         allocation_manager = AllocationManager(ledger, trade_backend)
         
@@ -208,8 +216,8 @@ class TestAdaptabilityMeasurer(unittest.TestCase):
         
     def test_shock_recording(self):
         """Test shock event recording."""
-        agent_nav = Decimal('95000.00')
-        hodl_nav = Decimal('98000.00')
+        agent_nav = _AGENT_NAV_AT_SHOCK
+        hodl_nav = _HODL_NAV_AT_SHOCK
         
         self.measurer.record_shock(10, "RATE_SHOCK", agent_nav, hodl_nav)
         
@@ -226,12 +234,12 @@ class TestAdaptabilityMeasurer(unittest.TestCase):
     def test_post_shock_performance_tracking(self):
         """Test performance tracking after shocks."""
         # Record initial shock
-        self.measurer.record_shock(10, "RATE_SHOCK", Decimal('95000.00'), Decimal('98000.00'))
+        self.measurer.record_shock(10, "RATE_SHOCK", _AGENT_NAV_AT_SHOCK, _HODL_NAV_AT_SHOCK)
         
         # Update performance for 3 ticks after shock
         for tick in range(11, 14):
-            agent_nav = Decimal('95000.00') + Decimal(str(tick - 10)) * Decimal('1000.00')
-            hodl_nav = Decimal('98000.00') + Decimal(str(tick - 10)) * Decimal('500.00')
+            agent_nav = _AGENT_NAV_AT_SHOCK + Decimal(tick - 10) * _SHOCK_INCREMENT_A
+            hodl_nav = _HODL_NAV_AT_SHOCK + Decimal(tick - 10) * _SHOCK_INCREMENT_B
             self.measurer.update_post_shock_performance(tick, agent_nav, hodl_nav)
             
         shock = self.measurer.shock_events[0]
@@ -241,8 +249,8 @@ class TestAdaptabilityMeasurer(unittest.TestCase):
         
         # Update for remaining ticks to complete measurement window
         for tick in range(14, 17):
-            agent_nav = Decimal('95000.00') + Decimal(str(tick - 10)) * Decimal('1000.00')
-            hodl_nav = Decimal('98000.00') + Decimal(str(tick - 10)) * Decimal('500.00')
+            agent_nav = _AGENT_NAV_AT_SHOCK + Decimal(tick - 10) * _SHOCK_INCREMENT_A
+            hodl_nav = _HODL_NAV_AT_SHOCK + Decimal(tick - 10) * _SHOCK_INCREMENT_B
             self.measurer.update_post_shock_performance(tick, agent_nav, hodl_nav)
             
         shock = self.measurer.shock_events[0]
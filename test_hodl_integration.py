@@ -1,3 +1,4 @@
+import copy
 import unittest
 from decimal import Decimal
 from unittest.mock import Mock, patch
@@ -8,30 +9,37 @@ from router import AllocationManager
 from backends import TradeBackend, ProjectBackend, DebtBackend
 from models import CapitalAllocationAction, EquityAlloc, NewsEvent
 from hodl_bot import HODLBot, AdaptabilityMeasurer
+from visualization.events import EventType, event_collector
+
+
+class PriceProvider:
+    """Routes ledger price lookups to the trade and debt backends."""
+
+    def __init__(self, trade_backend, debt_backend):
+        self.trade_backend = trade_backend
+        self.debt_backend = debt_backend
+        
+    def get_price(self, identifier: str):
+        return self.trade_backend.get_price(identifier)
+        
+    def get_bond_price(self, identifier: str):
+        return self.debt_backend.get_bond_price(identifier)
 
 
 class TestHODLIntegration(unittest.TestCase):
     """Integration tests for HODL bot comparison system."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the config-loaded backends once; each test works on deep copies."""
+        cls.backend_templates = (TradeBackend(), ProjectBackend(), DebtBackend())
+        
     def setUp(self):
         """Set up test fixtures with full system."""
-        # Create backends
-        self.trade_backend = TradeBackend()
-        self.project_backend = ProjectBackend()
-        self.debt_backend = DebtBackend()
-        
-        # Create price provider wrapper class
-        class PriceProvider:
-            def __init__(self, trade_backend, debt_backend):
-                self.trade_backend = trade_backend
-                self.debt_backend = debt_backend
-                
-            def get_price(self, identifier: str):
-                return self.trade_backend.get_price(identifier)
-                
-            def get_bond_price(self, identifier: str):
-                return self.debt_backend.get_bond_price(identifier)
+        # Create backends (fresh copies, so tests never share mutable state)
+        self.trade_backend, self.project_backend, self.debt_backend = copy.deepcopy(self.backend_templates)
         
+        # Create price provider wrapper
         price_provider = PriceProvider(self.trade_backend, self.debt_backend)
         
         # Initialize ledger and allocation manager
@@ -56,30 +64,22 @@ class TestHODLIntegration(unittest.TestCase):
         self.assertIsNotNone(engine.hodl_engine)
         self.assertIsNotNone(engine.adaptability_measurer)
         
-        # Run simulation for several ticks
-        observations = []
-        for tick in range(10):
-            # Create some actions for variety
-            action = None
-            if tick == 1:
-                action = CapitalAllocationAction(
-                    action_type="ALLOCATE_CAPITAL",
-                    comment="Test investment",
-                    allocations=[
-                        EquityAlloc(
-                            asset_type="EQUITY",
-                            ticker="AAPL",
-                            usd=Decimal('10000.00')
-                        )
-                    ],
-                    cognition_cost=Decimal('1.00')
+        # Run simulation for several ticks, investing once on the second tick
+        actions = [None] * 10
+        actions[1] = CapitalAllocationAction(
+            action_type="ALLOCATE_CAPITAL",
+            comment="Test investment",
+            allocations=[
+                EquityAlloc(
+                    asset_type="EQUITY",
+                    ticker="AAPL",
+                    usd=Decimal('10000.00')
                 )
-            
-            obs, reward, terminated, truncated, info = engine.tick(action)
-            observations.append(obs)
-            
-            if terminated or truncated:
-                break
+            ],
+            cognition_cost=Decimal('1.00')
+        )
+        results = engine.run(10, actions)
+        observations = [obs for obs, *_ in results]
         
         # Verify both engines are running
         main_nav = engine.ledger.get_nav()
@@ -141,38 +141,34 @@ class TestHODLIntegration(unittest.TestCase):
         )
         
         # Run simulation with active agent making strategic moves
-        for tick in range(15):
-            # Active agent makes strategic moves
-            active_action = None
-            if tick == 1:
-                active_action = CapitalAllocationAction(
-                    action_type="ALLOCATE_CAPITAL",
-                    comment="Active investment",
-                    allocations=[
-                        EquityAlloc(
-                            asset_type="EQUITY",
-                            ticker="AAPL",
-                            usd=Decimal('20000.00')
-                        )
-                    ],
-                    cognition_cost=Decimal('2.00')
+        active_actions = [None] * 15
+        active_actions[1] = CapitalAllocationAction(
+            action_type="ALLOCATE_CAPITAL",
+            comment="Active investment",
+            allocations=[
+                EquityAlloc(
+                    asset_type="EQUITY",
+                    ticker="AAPL",
+                    usd=Decimal('20000.00')
                 )
-            elif tick == 5:
-                active_action = CapitalAllocationAction(
-                    action_type="ALLOCATE_CAPITAL",
-                    comment="Diversification",
-                    allocations=[
-                        EquityAlloc(
-                            asset_type="EQUITY",
-                            ticker="GOOGL",
-                            usd=Decimal('15000.00')
-                        )
-                    ],
-                    cognition_cost=Decimal('1.50')
+            ],
+            cognition_cost=Decimal('2.00')
+        )
+        active_actions[5] = CapitalAllocationAction(
+            action_type="ALLOCATE_CAPITAL",
+            comment="Diversification",
+            allocations=[
+                EquityAlloc(
+                    asset_type="EQUITY",
+                    ticker="GOOGL",
+                    usd=Decimal('15000.00')
                 )
-            
-            # Run active engine (internal HODL comparison runs automatically)
-            active_obs, _, _, _, _ = active_engine.tick(active_action)
+            ],
+            cognition_cost=Decimal('1.50')
+        )
+        
+        # Run active engine (internal HODL comparison runs automatically)
+        active_engine.run(15, active_actions)
         
         # Get final NAVs from both the active agent and internal HODL comparison
         final_active_nav = active_engine.ledger.get_nav()
@@ -196,6 +192,29 @@ class TestHODLIntegration(unittest.TestCase):
         self.assertEqual(report['final_agent_nav'], final_active_nav)
         self.assertEqual(report['final_hodl_nav'], final_hodl_nav)
         
+    def test_hodl_engine_ticks_in_step(self):
+        """Test the HODL engine advances every tick, even when it has nothing to do."""
+        # A bare TradeBackend provider (with price_version), ticked without actions
+        ledger = Ledger(self.initial_cash, price_provider=self.trade_backend)
+        allocation_manager = AllocationManager(
+            ledger, self.trade_backend, self.project_backend, self.debt_backend
+        )
+        engine = SimulationEngine(ledger, allocation_manager, enable_hodl_comparison=True)
+        
+        for _ in range(6):
+            engine.tick(None)
+        
+        hodl_engine = engine.hodl_engine
+        self.assertEqual(hodl_engine.current_tick, engine.current_tick)
+        self.assertEqual(len(hodl_engine.nav_history), len(engine.nav_history))
+        
+        # Both engines report a portfolio update for every tick
+        updates = event_collector.get_events(event_type=EventType.PORTFOLIO_UPDATE)
+        self.assertEqual([e.tick for e in updates], [tick for tick in range(1, 7) for _ in range(2)])
+        # The HODL engine's updates are tagged, the agent's are not
+        self.assertEqual([e.data.get('source') for e in updates], [None, 'hodl'] * 6)
+        self.assertIsNone(event_collector.source)
+        
     def test_hodl_comparison_disabled(self):
         """Test engine works correctly when HODL comparison is disabled."""
         engine = SimulationEngine(
@@ -13,7 +13,7 @@ def test_ledger_initialization(price_provider):
     initial_cash = Decimal('1000.00')
     ledger = Ledger(initial_cash, price_provider)
     assert ledger.cash == initial_cash
-    assert ledger.assets == []
+    assert ledger.assets == ()
     assert ledger.price_provider is not None
 
 def test_add_asset_success(price_provider):
@@ -70,6 +70,42 @@ def test_remove_asset_insufficient_quantity(price_provider):
     assert ledger.cash == Decimal('500.00')
     assert ledger.assets[0].quantity == Decimal('10')
 
+def test_assets_read_only(price_provider):
+    """Test holdings can only change through add_asset/remove_asset."""
+    ledger = Ledger(Decimal('1000.00'), price_provider)
+    ledger.add_asset('EQUITY', 'AAPL', Decimal('10'), Decimal('500.00'))
+    with pytest.raises(AttributeError):
+        ledger.assets = []
+    with pytest.raises(AttributeError):
+        ledger.assets.append(ledger.assets[0])
+    with pytest.raises(AttributeError):
+        ledger.assets[0].quantity = Decimal('20')
+    with pytest.raises(AttributeError):
+        ledger.assets[0].cost_basis = Decimal('1.00')
+    assert len(ledger.assets) == 1
+    assert ledger.assets[0].quantity == Decimal('10')
+
+def test_nav_cache_invalidated_by_new_price_provider(price_provider):
+    """Test replacing the price provider drops the NAV cached with the old one."""
+    ledger = Ledger(Decimal('2000.00'), price_provider)
+    ledger.add_asset('EQUITY', 'AAPL', Decimal('10'), Decimal('1500.00'))
+    price_provider.update_prices({'AAPL': Decimal('160')})
+    assert ledger.get_nav() == Decimal('2100.00')
+
+    other = TradeBackend()
+    other.update_prices({'AAPL': Decimal('170')})  # Same price_version as the old provider
+    ledger.price_provider = other
+    assert ledger.get_nav() == Decimal('2200.00')
+    assert ledger.get_portfolio_holdings()[0].current_value == Decimal('1700.00')
+
+def test_holding_quantity_units(price_provider):
+    """Test held quantity is reported in integer units, 0 when not held."""
+    ledger = Ledger(Decimal('1000.00'), price_provider)
+    ledger.add_asset('EQUITY', 'AAPL', Decimal('10'), Decimal('500.00'))
+    assert ledger.holding_quantity_units('EQUITY', 'AAPL') == 10 * 10**8
+    assert ledger.holding_quantity_units('EQUITY', 'MSFT') == 0
+    assert ledger.holding_quantity_units('BOND', 'AAPL') == 0
+
 def test_nav_calculation_with_market_prices(price_provider):
     """Test NAV calculation with cash and market prices."""
     ledger = Ledger(Decimal('2000.00'), price_provider) # Increased initial cash
@@ -79,6 +115,21 @@ def test_nav_calculation_with_market_prices(price_provider):
     # NAV = cash + market_value = (2000-1500) + (10 * 160) = 500 + 1600 = 2100
     assert ledger.get_nav() == Decimal('2100.00')
 
+def test_nav_cache_invalidation(price_provider):
+    """Test cached NAV is refreshed after price updates and trades."""
+    ledger = Ledger(Decimal('2000.00'), price_provider)
+    ledger.add_asset('EQUITY', 'AAPL', Decimal('10'), Decimal('1500.00'))
+    price_provider.update_prices({'AAPL': Decimal('160')})
+    assert ledger.get_nav() == Decimal('2100.00')
+    assert ledger.get_nav() == Decimal('2100.00')  # Served from cache
+
+    price_provider.update_prices({'AAPL': Decimal('170')})
+    assert ledger.get_nav() == Decimal('2200.00')
+
+    ledger.remove_asset('EQUITY', 'AAPL', Decimal('5'))
+    ledger.cash = ledger.cash - Decimal('100.00')
+    assert ledger.get_nav() == Decimal('2100.00')
+
 def test_portfolio_holdings_with_market_value(price_provider):
     """Test getting portfolio holdings with market value."""
     ledger = Ledger(Decimal('2000.00'), price_provider) # Increased initial cash
@@ -89,6 +140,30 @@ def test_portfolio_holdings_with_market_value(price_provider):
     assert len(holdings) == 1
     assert holdings[0].current_value == Decimal('1600.00') # 10 * 160
 
+def test_holding_values_match_portfolio_holdings(price_provider):
+    """Test the array of holding values matches get_portfolio_holdings."""
+    ledger = Ledger(Decimal('2000.00'), price_provider)
+    ledger.add_asset('EQUITY', 'AAPL', Decimal('10'), Decimal('1500.00'))
+    ledger.add_asset('PROJECT', 'PROJ001', Decimal('1'), Decimal('100.00'))
+    price_provider.update_prices({'AAPL': Decimal('160')})
+
+    values = ledger.get_holding_values()
+    assert values.tolist() == [float(h.current_value) for h in ledger.get_portfolio_holdings()]
+    assert values.tolist() == [1600.0, 100.0]
+
+def test_portfolio_holdings_cache_invalidation(price_provider):
+    """Test cached holdings are refreshed after price updates and trades."""
+    ledger = Ledger(Decimal('2000.00'), price_provider)
+    ledger.add_asset('EQUITY', 'AAPL', Decimal('10'), Decimal('1500.00'))
+    price_provider.update_prices({'AAPL': Decimal('160')})
+    assert ledger.get_portfolio_holdings()[0].current_value == Decimal('1600.00')
+
+    price_provider.update_prices({'AAPL': Decimal('170')})
+    assert ledger.get_portfolio_holdings()[0].current_value == Decimal('1700.00')
+
+    ledger.remove_asset('EQUITY', 'AAPL', Decimal('5'))
+    assert ledger.get_portfolio_holdings()[0].quantity == Decimal('5')
+
 def test_multiple_same_assets(price_provider):
     """Test adding multiple quantities of same asset."""
     ledger = Ledger(Decimal('2000.00'), price_provider)
@@ -118,7 +193,7 @@ def test_nav_calculation_with_mixed_assets():
     ledger.add_asset('PROJECT', 'PROJ001', Decimal('1'), Decimal('3000.00'))  # $3000 project
     
     # Update market prices
-    backend.update_prices({'AAPL': Decimal('160.00')})  # Stock price up
+    backend.update_prices({'AAPL': Decimal('160')})  # Stock price up
     # Bond price is 105.00 (up from 100.00 cost basis)
     
     # Calculate expected NAV:
@@ -148,7 +223,7 @@ def test_portfolio_holdings_with_mixed_assets():
     ledger.add_asset('PROJECT', 'PROJ001', Decimal('1'), Decimal('2000.00'))
     
     # Update stock price
-    backend.update_prices({'AAPL': Decimal('160.00')})
+    backend.update_prices({'AAPL': Decimal('160')})
     
     holdings = ledger.get_portfolio_holdings()
     
@@ -5,8 +5,10 @@ from market_data.fetcher import DataFetcher, StockDataFetchError, EconomicDataFe
 @unittest.skipUnless(os.environ.get("RUN_MARKET_DATA_INTEGRATION_TESTS") == "1",
                      "Set RUN_MARKET_DATA_INTEGRATION_TESTS=1 to enable integration tests")
 class TestMarketDataIntegration(unittest.TestCase):
-    def setUp(self):
-        self.fetcher = DataFetcher()
+    @classmethod
+    def setUpClass(cls):
+        # One fetcher for the class so its FRED client and caches are reused
+        cls.fetcher = DataFetcher()
 
     def test_get_stock_data_real(self):
         # This test will make a real API call to yfinance
@@ -1,4 +1,7 @@
+import functools
 import unittest
+from unittest.mock import patch
+import numpy as np
 import pandas as pd
 from decimal import Decimal
 
@@ -9,18 +12,60 @@ from backends import TradeBackend, ProjectBackend, DebtBackend
 from market_data.engine import MarketDataEngine
 from config_loader import ConfigLoader
 
+
+@functools.lru_cache(maxsize=64)
+def _mk_dates(start_date, end_date):
+    """Daily DatetimeIndex shared by the mocks for a given date window."""
+    return pd.to_datetime(pd.date_range(start=start_date, end=end_date))
+
+
+def mock_get_stock_data(ticker, start_date, end_date):
+    """Mock yfinance data fetching."""
+    dates = _mk_dates(start_date, end_date)
+    j = 1 if ticker == 'GOOGL' else 0
+    prices = np.arange(len(dates), dtype=np.float64) + (150 + j * 10)
+    return pd.DataFrame({'Close': prices}, index=dates)
+
+
+def mock_get_economic_data(series_id, start_date, end_date):
+    """Mock FRED data fetching."""
+    dates = _mk_dates(start_date, end_date)
+    rates = 2.5 + np.arange(len(dates)) * 0.01
+    return pd.Series(rates, index=dates, name=series_id)
+
+
 class TestMarketIntegration(unittest.TestCase):
-    def setUp(self):
-        """Set up a full simulation environment with the MarketDataEngine."""
-        self.config_loader = ConfigLoader(config_path='config')
+    @classmethod
+    def setUpClass(cls):
+        """Build the config loader and MarketDataEngine once for all tests."""
+        cls.config_loader = ConfigLoader('config')
+
+        # Initializing MarketDataEngine
+        # NOTE: The real fetcher requires a FRED API key (and network access),
+        # so it is stubbed here and its data methods replaced with the mocks below
+        with patch('market_data.engine.DataFetcher') as fetcher_cls:
+            fetcher_cls.return_value.get_stock_data.return_value = None
+            fetcher_cls.return_value.get_economic_data.return_value = None
+            cls.market_data_engine = MarketDataEngine(
+                tickers=['AAPL', 'GOOGL'],
+                fred_series={'interest_rate': 'DGS10'},
+                fred_api_key=None  # Set API key here if running live tests
+            )
         
+        # Mocking the data fetching to avoid real API calls in tests
+        cls.market_data_engine.fetcher.get_stock_data = mock_get_stock_data
+        cls.market_data_engine.fetcher.get_economic_data = mock_get_economic_data
+        cls.market_data_engine.data = cls.market_data_engine._load_initial_data()
+
+    def setUp(self):
+        """Set up fresh backends, ledger and engine around the shared market data."""
         # Initializing Backends
         self.trade_backend = TradeBackend(self.config_loader)
         self.project_backend = ProjectBackend(self.config_loader)
         self.debt_backend = DebtBackend(self.config_loader)
 
         # Initializing Ledger and AllocationManager
-        self.ledger = Ledger(cash=Decimal('100000'), price_provider=self.trade_backend)
+        self.ledger = Ledger(initial_cash=Decimal('100000'), price_provider=self.trade_backend)
         self.allocation_manager = AllocationManager(
             ledger=self.ledger,
             trade_backend=self.trade_backend,
@@ -28,20 +73,6 @@ class TestMarketIntegration(unittest.TestCase):
             debt_backend=self.debt_backend
         )
 
-        # Initializing MarketDataEngine
-        # NOTE: This requires a FRED API key to be set as an environment variable
-        # For this test, we will mock the data fetching
-        self.market_data_engine = MarketDataEngine(
-            tickers=['AAPL', 'GOOGL'],
-            fred_series={'interest_rate': 'DGS10'},
-            fred_api_key=None  # Set API key here if running live tests
-        )
-        
-        # Mocking the data fetching to avoid real API calls in tests
-        self.market_data_engine.fetcher.get_stock_data = self.mock_get_stock_data
-        self.market_data_engine.fetcher.get_economic_data = self.mock_get_economic_data
-        self.market_data_engine.data = self.market_data_engine._load_initial_data()
-
         # Initializing SimulationEngine with the MarketDataEngine
         self.simulation_engine = SimulationEngine(
             ledger=self.ledger,
@@ -49,19 +80,6 @@ class TestMarketIntegration(unittest.TestCase):
             market_data_engine=self.market_data_engine
         )
 
-    def mock_get_stock_data(self, ticker, start_date, end_date):
-        """Mock yfinance data fetching."""
-        dates = pd.to_datetime(pd.date_range(start=start_date, end=end_date))
-        prices = [150 + i + (j * 10) for i, date in enumerate(dates)]
-        j = 1 if ticker == 'GOOGL' else 0
-        return pd.DataFrame({'Close': prices}, index=dates)
-
-    def mock_get_economic_data(self, series_id, start_date, end_date):
-        """Mock FRED data fetching."""
-        dates = pd.to_datetime(pd.date_range(start=start_date, end=end_date))
-        rates = [2.5 + i * 0.01 for i, date in enumerate(dates)]
-        return pd.Series(rates, index=dates, name=series_id)
-
     def test_simulation_tick_updates_prices_and_rates(self):
         """Verify that a simulation tick updates stock prices and interest rates."""
         # Get initial prices and bond yields
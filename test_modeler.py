@@ -4,14 +4,19 @@ import pandas as pd
 from market_data.modeler import FinancialModeler
 
 class TestFinancialModeler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Simulated returns shared by all tests; the modeler does not mutate them
+        rng = np.random.default_rng(42)
+        cls.returns_1d = pd.Series(rng.normal(0, 0.01, 100))
+        cls.returns_3d = pd.DataFrame(rng.normal(0, 0.01, (100, 3)), columns=['A', 'B', 'C'])
+
     def setUp(self):
         self.modeler = FinancialModeler()
 
     def test_garch_forecast_valid(self):
-        # Simulate returns with some volatility
-        np.random.seed(42)
-        returns = pd.Series(np.random.normal(0, 0.01, 100))
-        forecast = self.modeler.calculate_garch_forecast(returns)
+        # Simulated returns with some volatility
+        forecast = self.modeler.calculate_garch_forecast(self.returns_1d)
         self.assertIsInstance(forecast, float)
         self.assertGreater(forecast, 0)
 
@@ -21,11 +26,8 @@ class TestFinancialModeler(unittest.TestCase):
         self.assertIsNone(forecast)
 
     def test_correlation_matrix_valid(self):
-        # Simulate returns for 3 stocks
-        np.random.seed(42)
-        data = np.random.normal(0, 0.01, (100, 3))
-        returns_df = pd.DataFrame(data, columns=['A', 'B', 'C'])
-        corr_matrix = self.modeler.calculate_correlation_matrix(returns_df)
+        # Simulated returns for 3 stocks
+        corr_matrix = self.modeler.calculate_correlation_matrix(self.returns_3d)
         self.assertIsInstance(corr_matrix, pd.DataFrame)
         self.assertEqual(corr_matrix.shape, (3, 3))
         # Diagonal should be 1
@@ -52,10 +52,9 @@ def test_capital_allocation_action_validation():
     action = CapitalAllocationAction(**action_data)
     assert action.action_type == "ALLOCATE_CAPITAL"
     assert len(action.allocations) == 4
-    assert isinstance(action.allocations[0], EquityAlloc)
-    assert isinstance(action.allocations[1], ProjectAlloc)
-    assert isinstance(action.allocations[2], BondAlloc)
-    assert isinstance(action.allocations[3], CashAlloc)
+    assert [a.asset_type for a in action.allocations] == ["EQUITY", "PROJECT", "BOND", "CASH"]
+    # The discriminator must also have picked the matching model for each entry
+    assert {type(a).__name__ for a in action.allocations} == {"EquityAlloc", "ProjectAlloc", "BondAlloc", "CashAlloc"}
     assert action.allocations[0].ticker == "GOOG"
     assert action.allocations[1].project_id == "proj_123"
 
@@ -98,10 +97,11 @@ def test_discriminated_union_works_correctly():
         allocations=allocations_data,
         cognition_cost=Decimal("0.50")
     )
-    assert isinstance(action.allocations[0], EquityAlloc)
-    assert action.allocations[0].ticker == "TSLA"
-    assert isinstance(action.allocations[1], ProjectAlloc)
-    assert action.allocations[1].project_id == "proj_789"
+    allocs = action.allocations
+    assert allocs[0].asset_type == "EQUITY"
+    assert allocs[0].ticker == "TSLA"
+    assert allocs[1].asset_type == "PROJECT"
+    assert allocs[1].project_id == "proj_789"
 
 def test_invalid_asset_type_in_union():
     """Tests that an invalid asset_type in the discriminated union fails validation."""
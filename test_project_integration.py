@@ -47,34 +47,26 @@ class TestProjectIntegration:
         assert obs.cash == Decimal('80000.00')  # 100k - 20k
         
         # Verify project appears in portfolio
-        project_holdings = [h for h in obs.portfolio if h.asset_type == "PROJECT"]
+        project_holdings = obs.project_holdings
         assert len(project_holdings) == 1
         assert project_holdings[0].identifier == "P-004"
         assert project_holdings[0].current_value == Decimal('20000.00')
         
         # Verify project is no longer fully available
-        biotech_projects = [p for p in obs.projects_available if p.project_id == "P-004"]
-        assert len(biotech_projects) == 1
-        assert biotech_projects[0].required_investment == Decimal('10000.00')  # 30k - 20k
+        assert obs.projects_by_id["P-004"].required_investment == Decimal('10000.00')  # 30k - 20k
         
         # Advance time until project completes (6 weeks)
-        final_obs = None
-        project_completion_news = []
+        final_obs, news = engine.run_ticks(6)
         
-        for week in range(6):
-            obs, reward, terminated, truncated, info = engine.tick()
-            final_obs = obs
-            
-            # Collect project completion news
-            project_news = [n for n in obs.news if n.event_type == "PROJECT_COMPLETION"]
-            project_completion_news.extend(project_news)
+        # Collect project completion news
+        project_completion_news = [n for n in news if n.event_type == "PROJECT_COMPLETION"]
         
         # Verify project completed
         assert len(project_completion_news) == 1
         assert "Biotech Research" in project_completion_news[0].description
         
         # Verify project asset removed from portfolio
-        final_project_holdings = [h for h in final_obs.portfolio if h.asset_type == "PROJECT"]
+        final_project_holdings = final_obs.project_holdings
         assert len(final_project_holdings) == 0
         
         # Verify cash changed (payout received)
@@ -116,7 +108,7 @@ class TestProjectIntegration:
         assert obs.cash == Decimal('105000.00')  # 200k - 95k
         
         # Verify all projects in portfolio
-        project_holdings = [h for h in obs.portfolio if h.asset_type == "PROJECT"]
+        project_holdings = obs.project_holdings
         assert len(project_holdings) == 3
         
         project_ids = {h.identifier for h in project_holdings}
@@ -129,24 +121,23 @@ class TestProjectIntegration:
         # Advance time and check for completions
         completed_projects = set()
         
-        for week in range(16):  # Longest project is 16 weeks
-            obs, reward, terminated, truncated, info = engine.tick()
-            
-            # Track completed projects
-            for news in obs.news:
-                if news.event_type == "PROJECT_COMPLETION":
-                    if "Infrastructure Bond" in news.description:
-                        completed_projects.add("P-005")
-                    elif "Tech Startup Alpha" in news.description:
-                        completed_projects.add("P-001")
-                    elif "Green Energy Initiative" in news.description:
-                        completed_projects.add("P-002")
+        obs, all_news = engine.run_ticks(16)  # Longest project is 16 weeks
+        
+        # Track completed projects
+        for news in all_news:
+            if news.event_type == "PROJECT_COMPLETION":
+                if "Infrastructure Bond" in news.description:
+                    completed_projects.add("P-005")
+                elif "Tech Startup Alpha" in news.description:
+                    completed_projects.add("P-001")
+                elif "Green Energy Initiative" in news.description:
+                    completed_projects.add("P-002")
         
         # All projects should have completed
         assert completed_projects == {"P-001", "P-002", "P-005"}
         
         # No project assets should remain
-        final_project_holdings = [h for h in obs.portfolio if h.asset_type == "PROJECT"]
+        final_project_holdings = obs.project_holdings
         assert len(final_project_holdings) == 0
 
     def test_project_with_trade_integration(self):
@@ -185,8 +176,8 @@ class TestProjectIntegration:
         assert obs.cash == Decimal('25000.00')  # 150k - 125k
         
         # Verify portfolio composition
-        equity_holdings = [h for h in obs.portfolio if h.asset_type == "EQUITY"]
-        project_holdings = [h for h in obs.portfolio if h.asset_type == "PROJECT"]
+        equity_holdings = obs.equity_holdings
+        project_holdings = obs.project_holdings
         
         assert len(equity_holdings) == 2
         assert len(project_holdings) == 2
@@ -206,21 +197,17 @@ class TestProjectIntegration:
         assert obs.nav == expected_nav
         
         # Advance time to see project completions
-        project_news_count = 0
+        obs, all_news = engine.run_ticks(16)
         
-        for week in range(16):
-            obs, reward, terminated, truncated, info = engine.tick()
-            
-            # Count project completion news
-            project_news = [n for n in obs.news if n.event_type == "PROJECT_COMPLETION"]
-            project_news_count += len(project_news)
+        # Count project completion news
+        project_news_count = sum(1 for n in all_news if n.event_type == "PROJECT_COMPLETION")
         
         # Should have 2 project completions
         assert project_news_count == 2
         
         # Equity holdings should remain, projects should be completed
-        final_equity_holdings = [h for h in obs.portfolio if h.asset_type == "EQUITY"]
-        final_project_holdings = [h for h in obs.portfolio if h.asset_type == "PROJECT"]
+        final_equity_holdings = obs.equity_holdings
+        final_project_holdings = obs.project_holdings
         
         assert len(final_equity_holdings) == 2  # Stocks remain
         assert len(final_project_holdings) == 0  # Projects completed
@@ -265,7 +252,7 @@ class TestProjectIntegration:
         assert "P-999" in failed_project_ids
         
         # Only one project should be in portfolio
-        project_holdings = [h for h in obs.portfolio if h.asset_type == "PROJECT"]
+        project_holdings = obs.project_holdings
         assert len(project_holdings) == 1
         assert project_holdings[0].identifier == "P-005"
         
@@ -298,7 +285,7 @@ class TestProjectIntegration:
         obs1, _, _, _, _ = engine.tick(action1)
         
         # Verify partial funding
-        p001_available = next(p for p in obs1.projects_available if p.project_id == "P-001")
+        p001_available = obs1.projects_by_id["P-001"]
         assert p001_available.required_investment == Decimal('20000.00')  # 50k - 30k
         
         # Second investor completes funding
@@ -314,11 +301,10 @@ class TestProjectIntegration:
         obs2, _, _, _, _ = engine.tick(action2)
         
         # Project should no longer be available
-        p001_projects = [p for p in obs2.projects_available if p.project_id == "P-001"]
-        assert len(p001_projects) == 0
+        assert "P-001" not in obs2.projects_by_id
         
         # Should have 1 consolidated project holding for same project
-        project_holdings = [h for h in obs2.portfolio if h.asset_type == "PROJECT" and h.identifier == "P-001"]
+        project_holdings = [h for h in obs2.project_holdings if h.identifier == "P-001"]
         assert len(project_holdings) == 1
         
         # Should have quantity 2.0 (two separate investments consolidated)
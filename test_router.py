@@ -1,36 +1,55 @@
 import pytest
 from decimal import Decimal
-from unittest.mock import Mock
 from router import AllocationManager
-from backends import TradeBackend
-from ledger import Ledger
 from models import CapitalAllocationAction, EquityAlloc, FailedAllocation
 
+
+class FakeLedger:
+    """Plain stand-in for Ledger; the router only passes it through to backends."""
+    def __init__(self, cash: Decimal):
+        self.cash = cash
+        self.assets = []
+
+
+class FakeTradeBackend:
+    """Stand-in for TradeBackend that replays scripted results and records calls.
+
+    Each scripted result is returned in turn; an exception instance is raised instead.
+    """
+    def __init__(self):
+        self.results = []
+        self.calls = []
+
+    def execute_allocation(self, allocation, ledger):
+        self.calls.append(allocation)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
 @pytest.fixture
-def mock_ledger():
-    """Fixture for a mock Ledger."""
-    ledger = Mock(spec=Ledger)
-    ledger.cash = Decimal('10000.00')
-    ledger.assets = []
-    return ledger
+def fake_ledger():
+    """Fixture for a fake Ledger."""
+    return FakeLedger(Decimal('10000.00'))
 
 @pytest.fixture
-def mock_trade_backend():
-    """Fixture for a mock TradeBackend."""
-    return Mock(spec=TradeBackend)
+def fake_trade_backend():
+    """Fixture for a fake TradeBackend."""
+    return FakeTradeBackend()
 
-def test_allocation_manager_initialization(mock_ledger, mock_trade_backend):
+def test_allocation_manager_initialization(fake_ledger, fake_trade_backend):
     """Test manager initializes correctly."""
-    manager = AllocationManager(ledger=mock_ledger, trade_backend=mock_trade_backend)
-    assert manager.ledger == mock_ledger
-    assert manager.trade_backend == mock_trade_backend
+    manager = AllocationManager(ledger=fake_ledger, trade_backend=fake_trade_backend)
+    assert manager.ledger == fake_ledger
+    assert manager.trade_backend == fake_trade_backend
 
-def test_execute_equity_buy_success(mock_ledger, mock_trade_backend):
+def test_execute_equity_buy_success(fake_ledger, fake_trade_backend):
     """Test successful stock purchase."""
-    manager = AllocationManager(ledger=mock_ledger, trade_backend=mock_trade_backend)
+    manager = AllocationManager(ledger=fake_ledger, trade_backend=fake_trade_backend)
     
-    # Mock trade_backend to return success
-    mock_trade_backend.execute_allocation.return_value = True
+    # Script trade_backend to return success
+    fake_trade_backend.results = [True]
     
     buy_action = CapitalAllocationAction(
         action_type="ALLOCATE_CAPITAL",
@@ -42,14 +61,14 @@ def test_execute_equity_buy_success(mock_ledger, mock_trade_backend):
     failed = manager.execute_action(buy_action)
     
     assert not failed
-    mock_trade_backend.execute_allocation.assert_called_once()
+    assert len(fake_trade_backend.calls) == 1
 
-def test_execute_equity_buy_insufficient_funds(mock_ledger, mock_trade_backend):
+def test_execute_equity_buy_insufficient_funds(fake_ledger, fake_trade_backend):
     """Test buy fails with insufficient cash."""
-    manager = AllocationManager(ledger=mock_ledger, trade_backend=mock_trade_backend)
+    manager = AllocationManager(ledger=fake_ledger, trade_backend=fake_trade_backend)
     
-    # Mock trade_backend to return failure
-    mock_trade_backend.execute_allocation.return_value = False
+    # Script trade_backend to return failure
+    fake_trade_backend.results = [False]
     
     buy_action = CapitalAllocationAction(
         action_type="ALLOCATE_CAPITAL",
@@ -62,14 +81,14 @@ def test_execute_equity_buy_insufficient_funds(mock_ledger, mock_trade_backend):
     
     assert len(failed) == 1
     assert failed[0].reason == "Trade execution failed"
-    mock_trade_backend.execute_allocation.assert_called_once()
+    assert len(fake_trade_backend.calls) == 1
 
-def test_execute_equity_sell_success(mock_ledger, mock_trade_backend):
+def test_execute_equity_sell_success(fake_ledger, fake_trade_backend):
     """Test successful stock sale."""
-    manager = AllocationManager(ledger=mock_ledger, trade_backend=mock_trade_backend)
+    manager = AllocationManager(ledger=fake_ledger, trade_backend=fake_trade_backend)
     
-    # Mock trade_backend to return success
-    mock_trade_backend.execute_allocation.return_value = True
+    # Script trade_backend to return success
+    fake_trade_backend.results = [True]
     
     sell_action = CapitalAllocationAction(
         action_type="ALLOCATE_CAPITAL",
@@ -81,14 +100,14 @@ def test_execute_equity_sell_success(mock_ledger, mock_trade_backend):
     failed = manager.execute_action(sell_action)
     
     assert not failed
-    mock_trade_backend.execute_allocation.assert_called_once()
+    assert len(fake_trade_backend.calls) == 1
 
-def test_execute_equity_sell_insufficient_shares(mock_ledger, mock_trade_backend):
+def test_execute_equity_sell_insufficient_shares(fake_ledger, fake_trade_backend):
     """Test sell fails with insufficient shares."""
-    manager = AllocationManager(ledger=mock_ledger, trade_backend=mock_trade_backend)
+    manager = AllocationManager(ledger=fake_ledger, trade_backend=fake_trade_backend)
     
-    # Mock trade_backend to return failure
-    mock_trade_backend.execute_allocation.return_value = False
+    # Script trade_backend to return failure
+    fake_trade_backend.results = [False]
     
     sell_action = CapitalAllocationAction(
         action_type="ALLOCATE_CAPITAL",
@@ -101,14 +120,14 @@ def test_execute_equity_sell_insufficient_shares(mock_ledger, mock_trade_backend
     
     assert len(failed) == 1
     assert failed[0].reason == "Trade execution failed"
-    mock_trade_backend.execute_allocation.assert_called_once()
+    assert len(fake_trade_backend.calls) == 1
 
-def test_multiple_allocations(mock_ledger, mock_trade_backend):
+def test_multiple_allocations(fake_ledger, fake_trade_backend):
     """Test processing multiple allocations in one action."""
-    manager = AllocationManager(ledger=mock_ledger, trade_backend=mock_trade_backend)
+    manager = AllocationManager(ledger=fake_ledger, trade_backend=fake_trade_backend)
     
-    # Mock trade_backend to succeed on first call, fail on second
-    mock_trade_backend.execute_allocation.side_effect = [True, False]
+    # Script trade_backend to succeed on first call, fail on second
+    fake_trade_backend.results = [True, False]
     
     actions = CapitalAllocationAction(
         action_type="ALLOCATE_CAPITAL",
@@ -124,14 +143,28 @@ def test_multiple_allocations(mock_ledger, mock_trade_backend):
     
     assert len(failed) == 1
     assert failed[0].allocation.ticker == "GOOGL"
-    assert mock_trade_backend.execute_allocation.call_count == 2
+    assert len(fake_trade_backend.calls) == 2
+
+def test_empty_action_skips_backends(fake_ledger, fake_trade_backend):
+    """Test an action without allocations never reaches the backends."""
+    manager = AllocationManager(ledger=fake_ledger, trade_backend=fake_trade_backend)
+    
+    empty_action = CapitalAllocationAction(
+        action_type="ALLOCATE_CAPITAL",
+        comment="hold",
+        cognition_cost=Decimal("0.0"),
+        allocations=[]
+    )
+    
+    assert manager.execute_action(empty_action) == []
+    assert fake_trade_backend.calls == []
 
-def test_failed_allocation_tracking(mock_ledger, mock_trade_backend):
+def test_failed_allocation_tracking(fake_ledger, fake_trade_backend):
     """Test that failed allocations are properly tracked."""
-    manager = AllocationManager(ledger=mock_ledger, trade_backend=mock_trade_backend)
+    manager = AllocationManager(ledger=fake_ledger, trade_backend=fake_trade_backend)
     
-    # Mock trade_backend to raise an exception
-    mock_trade_backend.execute_allocation.side_effect = Exception("Market closed")
+    # Script trade_backend to raise an exception
+    fake_trade_backend.results = [Exception("Market closed")]
     
     buy_action = CapitalAllocationAction(
         action_type="ALLOCATE_CAPITAL",
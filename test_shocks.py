@@ -5,84 +5,131 @@ import pandas as pd
 from unittest.mock import Mock, patch
 from market_data.engine import MarketDataEngine
 
+# Simulation date shared by every test, parsed once
+CURRENT_DATE = pd.Timestamp("2024-06-01")
+PREVIOUS_DATE = pd.Timestamp("2024-05-31")
+
+
+@pytest.fixture(scope="module")
+def tickers():
+    return ["AAPL", "GOOG"]
+
+
+@pytest.fixture(scope="module")
+def fred_series():
+    return {"FEDFUNDS": "FEDFUNDS"}
+
+
+@pytest.fixture(scope="module")
+def price_shock_df():
+    """Two closes with a sudden drop to 50.0 on the current date."""
+    return pd.DataFrame({"Close": [100.0, 50.0]}, index=[PREVIOUS_DATE, CURRENT_DATE])
+
+
+@pytest.fixture(scope="module")
+def volatile_df():
+    """Five wildly swinging closes leading up to the current date."""
+    return pd.DataFrame({"Close": [100, 80, 120, 60, 130]}, index=pd.date_range("2024-05-27", periods=5))
+
+
+@pytest.fixture(scope="module")
+def rate_shock_series():
+    """Interest rate jumping from 5.0 to 7.5 on the current date."""
+    return pd.Series([5.0, 7.5], index=[PREVIOUS_DATE, CURRENT_DATE])
+
+
+@pytest.fixture(scope="module")
+def partial_df():
+    return pd.DataFrame({"Close": [100, 110]}, index=[PREVIOUS_DATE, CURRENT_DATE])
+
+
+@pytest.fixture(scope="module")
+def trending_df():
+    return pd.DataFrame({"Close": [100, 110, 120]}, index=pd.date_range("2024-05-29", periods=3))
+
+
+@pytest.fixture(scope="module")
+def correlation_df(tickers):
+    return pd.DataFrame([[1.0, 0.5], [0.5, 1.0]], columns=tickers, index=tickers)
+
+
+@pytest.fixture
+def engine(tickers, fred_series):
+    # Built per test: tests patch the engine's fetcher/modeler and it memoizes updates.
+    # The fetcher is stubbed so construction neither needs a FRED key nor hits the network.
+    with patch("market_data.engine.DataFetcher") as fetcher_cls:
+        fetcher_cls.return_value.get_stock_data.return_value = None
+        fetcher_cls.return_value.get_economic_data.return_value = None
+        return MarketDataEngine(tickers, fred_series, fred_api_key=None)
+
+
 class TestMarketDataEngineShocks:
     """Test cases for MarketDataEngine's ability to generate and propagate market shocks."""
 
-    def setup_method(self):
-        # Example tickers and economic series
-        self.tickers = ["AAPL", "GOOG"]
-        self.fred_series = {"FEDFUNDS": "FEDFUNDS"}
-        self.current_date = pd.Timestamp("2024-06-01")
-        self.engine = MarketDataEngine(self.tickers, self.fred_series, fred_api_key=None)
-
-    def test_price_shock_propagation(self):
+    def test_price_shock_propagation(self, engine, price_shock_df):
         """Simulate a sudden price drop and verify propagation in market update."""
         # Mock fetcher to simulate a price shock
-        shock_price = 50.0
-        with patch.object(self.engine.fetcher, "get_stock_data") as mock_get_stock_data:
-            # Simulate DataFrame with a sudden drop
-            df = pd.DataFrame({"Close": [100.0, shock_price]}, index=[
-                pd.Timestamp("2024-05-31"), self.current_date
-            ])
-            mock_get_stock_data.return_value = df
-
-            update = self.engine.get_market_update(self.current_date)
-            assert update["prices"]["AAPL"] == shock_price
-            assert update["prices"]["GOOG"] == shock_price
-
-    def test_volatility_shock_propagation(self):
+        with patch.object(engine.fetcher, "get_stock_data", return_value=price_shock_df):
+            update = engine.get_market_update(CURRENT_DATE)
+            assert update["prices"]["AAPL"] == 50.0
+            assert update["prices"]["GOOG"] == 50.0
+
+    def test_volatility_shock_propagation(self, engine, tickers, volatile_df):
         """Simulate a volatility spike and verify modeling output."""
-        with patch.object(self.engine.fetcher, "get_stock_data") as mock_get_stock_data, \
-             patch.object(self.engine.modeler, "calculate_garch_forecast") as mock_garch:
-            # Simulate price series with high volatility
-            df = pd.DataFrame({"Close": [100, 80, 120, 60, 130]}, index=pd.date_range("2024-05-27", periods=5))
-            mock_get_stock_data.return_value = df
-            mock_garch.return_value = 0.25  # Simulated high volatility
-
-            update = self.engine.get_market_update(self.current_date)
-            for ticker in self.tickers:
+        with patch.object(engine.fetcher, "get_stock_data", return_value=volatile_df), \
+             patch.object(engine.modeler, "calculate_garch_forecast", return_value=0.25):  # Simulated high volatility
+            update = engine.get_market_update(CURRENT_DATE)
+            for ticker in tickers:
                 assert update["modeling"][f"{ticker}_volatility"] == 0.25
 
-    def test_interest_rate_shock_propagation(self):
+    def test_interest_rate_shock_propagation(self, engine, rate_shock_series):
         """Simulate a sudden interest rate change and verify economic data propagation."""
-        with patch.object(self.engine.fetcher, "get_economic_data") as mock_get_economic_data:
-            # Simulate economic series with a rate jump
-            series = pd.Series([5.0, 7.5], index=[pd.Timestamp("2024-05-31"), self.current_date])
-            mock_get_economic_data.return_value = series
-
-            update = self.engine.get_market_update(self.current_date)
+        with patch.object(engine.fetcher, "get_economic_data", return_value=rate_shock_series):
+            update = engine.get_market_update(CURRENT_DATE)
             assert update["economic"]["FEDFUNDS"] == 7.5
 
-    def test_missing_data_handling(self):
+    def test_missing_data_handling(self, engine):
         """Test that missing data is handled gracefully."""
-        with patch.object(self.engine.fetcher, "get_stock_data", return_value=None), \
-             patch.object(self.engine.fetcher, "get_economic_data", return_value=None):
-            update = self.engine.get_market_update(self.current_date)
+        with patch.object(engine.fetcher, "get_stock_data", return_value=None), \
+             patch.object(engine.fetcher, "get_economic_data", return_value=None):
+            update = engine.get_market_update(CURRENT_DATE)
             assert update["prices"] == {}
             assert update["economic"] == {}
             assert update["modeling"] == {}
 
-    def test_partial_data(self):
+    def test_partial_data(self, engine, partial_df):
         """Test that partial data (one ticker missing) is handled correctly."""
         def get_stock_data_side_effect(ticker, *args, **kwargs):
-            if ticker == "AAPL":
-                return pd.DataFrame({"Close": [100, 110]}, index=[pd.Timestamp("2024-05-31"), self.current_date])
-            else:
-                return None
-        with patch.object(self.engine.fetcher, "get_stock_data", side_effect=get_stock_data_side_effect):
-            update = self.engine.get_market_update(self.current_date)
+            return partial_df if ticker == "AAPL" else None
+        with patch.object(engine.fetcher, "get_stock_data", side_effect=get_stock_data_side_effect):
+            update = engine.get_market_update(CURRENT_DATE)
             assert "AAPL" in update["prices"]
             assert "GOOG" not in update["prices"]
 
-    def test_correlation_matrix_output(self):
+    def test_correlation_matrix_output(self, engine, trending_df, correlation_df):
         """Test that correlation matrix is included when multiple tickers have data."""
-        with patch.object(self.engine.fetcher, "get_stock_data") as mock_get_stock_data, \
-             patch.object(self.engine.modeler, "calculate_correlation_matrix") as mock_corr:
-            # Simulate price series for both tickers
-            df = pd.DataFrame({"Close": [100, 110, 120]}, index=pd.date_range("2024-05-29", periods=3))
-            mock_get_stock_data.return_value = df
-            mock_corr.return_value = pd.DataFrame([[1.0, 0.5], [0.5, 1.0]], columns=self.tickers, index=self.tickers)
-
-            update = self.engine.get_market_update(self.current_date)
+        with patch.object(engine.fetcher, "get_stock_data", return_value=trending_df), \
+             patch.object(engine.modeler, "calculate_correlation_matrix", return_value=correlation_df):
+            update = engine.get_market_update(CURRENT_DATE)
             assert "correlation_matrix" in update["modeling"]
-            assert update["modeling"]["correlation_matrix"]["AAPL"]["GOOG"] == 0.5
\ No newline at end of file
+            assert update["modeling"]["correlation_matrix"]["AAPL"]["GOOG"] == 0.5
+
+    def test_market_update_cache(self, engine, partial_df, price_shock_df):
+        """Test memoized updates are copies, and are refreshed by clear_cache or a new fetcher."""
+        with patch.object(engine.fetcher, "get_stock_data", return_value=partial_df), \
+             patch.object(engine.fetcher, "get_economic_data", return_value=None):
+            update = engine.get_market_update(CURRENT_DATE)
+            update["prices"]["AAPL"] = -1.0
+            assert engine.get_market_update(CURRENT_DATE)["prices"]["AAPL"] == 110
+        
+        # A patched fetcher is only picked up once the cache is cleared
+        with patch.object(engine.fetcher, "get_stock_data", return_value=price_shock_df), \
+             patch.object(engine.fetcher, "get_economic_data", return_value=None):
+            engine.clear_cache()
+            assert engine.get_market_update(CURRENT_DATE)["prices"]["AAPL"] == 50.0
+        
+        # Replacing the fetcher drops the updates built with the old one
+        engine.fetcher = Mock()
+        engine.fetcher.get_stock_data.return_value = partial_df
+        engine.fetcher.get_economic_data.return_value = None
+        assert engine.get_market_update(CURRENT_DATE)["prices"]["AAPL"] == 110
@@ -0,0 +1,275 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from visualization import events as events_module
+from visualization import web_server
+from visualization.events import EventCollector, EventType
+from visualization.web_server import (
+    COALESCE_WINDOW, ConnectionManager, PortfolioStats, VisualizationServer, _batch_frame
+)
+
+
+@pytest.fixture
+def small_history(monkeypatch):
+    """Shrink the in-memory history and spill batches so eviction is easy to reach."""
+    monkeypatch.setattr(events_module, 'MAX_EVENTS', 10)
+    monkeypatch.setattr(events_module, 'SPILL_BATCH_SIZE', 4)
+
+
+def _emit_ticks(collector, count):
+    """Emit one event per tick, alternating price and portfolio updates."""
+    for tick in range(count):
+        event_type = EventType.PRICE_UPDATE if tick % 2 else EventType.PORTFOLIO_UPDATE
+        collector.emit(event_type, tick, {'nav': 1000 + tick})
+
+
+def test_get_events_filters():
+    """Test type, tick range and limit filters on the in-memory history."""
+    collector = EventCollector()
+    _emit_ticks(collector, 20)
+
+    assert [e.tick for e in collector.get_events()] == list(range(20))
+    assert [e.tick for e in collector.get_events(limit=3)] == [17, 18, 19]
+    assert [e.tick for e in collector.get_events(start_tick=5, end_tick=8)] == [5, 6, 7, 8]
+    assert [e.tick for e in collector.get_events(start_tick=5, end_tick=12, limit=2)] == [11, 12]
+    assert [e.tick for e in collector.get_events(event_type=EventType.PRICE_UPDATE, limit=2)] == [17, 19]
+    assert [e.tick for e in collector.get_events(event_type=EventType.PORTFOLIO_UPDATE, end_tick=5)] == [0, 2, 4]
+    assert collector.get_events(event_type=EventType.TRADE_EXECUTED) == []
+    assert collector.get_events(limit=0) == []
+
+
+def test_eviction_without_spill(small_history):
+    """Test evicted events also leave the type index when nothing is spilled."""
+    collector = EventCollector()
+    _emit_ticks(collector, 25)
+
+    assert [e.tick for e in collector.get_events()] == list(range(15, 25))
+    assert sum(len(events) for events in collector._by_type.values()) == 10
+    assert [e.tick for e in collector.get_events(event_type=EventType.PRICE_UPDATE)] == [15, 17, 19, 21, 23]
+
+
+def test_spill_round_trip(small_history, tmp_path):
+    """Test evicted events are spilled to disk and returned by get_events."""
+    collector = EventCollector(spill_path=str(tmp_path / 'events.jsonl'))
+    _emit_ticks(collector, 31)
+
+    # 21 evicted: 20 flushed in batches of 4, 1 still pending
+    assert len(collector._spill_index) == 5
+    assert len(collector._spill_pending) == 1
+
+    spilled = collector.get_events()
+    assert [e.tick for e in spilled] == list(range(31))
+    assert spilled[0].event_type is EventType.PORTFOLIO_UPDATE
+    assert spilled[0].data == {'nav': 1000}
+    assert spilled[0].nav == 1000.0
+
+    # Filters reach into the spilled and pending events
+    assert [e.tick for e in collector.get_events(start_tick=5, end_tick=8)] == [5, 6, 7, 8]
+    assert [e.tick for e in collector.get_events(start_tick=14, end_tick=22)] == list(range(14, 23))
+    assert [e.tick for e in collector.get_events(start_tick=18, end_tick=22)] == list(range(18, 23))
+    assert [e.tick for e in collector.get_events(limit=12)] == list(range(19, 31))
+    assert [e.tick for e in collector.get_events(event_type=EventType.PRICE_UPDATE, end_tick=7)] == [1, 3, 5, 7]
+    assert [e.tick for e in collector.get_events(event_type=EventType.PRICE_UPDATE, limit=7)] == list(range(17, 31, 2))
+
+
+def test_clear_events_clears_spill(small_history, tmp_path):
+    """Test clear_events empties memory, the spill file and bumps the generation."""
+    spill_path = tmp_path / 'events.jsonl'
+    collector = EventCollector(spill_path=str(spill_path))
+    _emit_ticks(collector, 30)
+    generation = collector.generation
+
+    collector.clear_events()
+    assert collector.get_events() == []
+    assert spill_path.read_bytes() == b''
+    assert collector.generation == generation + 1
+
+    _emit_ticks(collector, 3)
+    assert [e.tick for e in collector.get_events()] == [0, 1, 2]
+
+
+def test_portfolio_stats_add_matches_load():
+    """Test per-update statistics equal those computed over the whole series."""
+    navs = np.array([1000.0, 1010.0, 990.0, 0.0, 1200.0, 1180.0])
+    ticks = np.arange(1, len(navs) + 1)
+
+    added = PortfolioStats()
+    for nav, tick in zip(navs, ticks):
+        added.add(float(nav), int(tick))
+    loaded = PortfolioStats()
+    loaded.load(navs, ticks)
+
+    for stats in (added, loaded):
+        assert stats.count == 6
+        assert stats.initial_nav == 1000.0
+        assert stats.current_nav == 1180.0
+        assert stats.max_nav == 1200.0
+        assert stats.navs.tolist() == navs.tolist()
+        assert stats.ticks.tolist() == ticks.tolist()
+    assert added.returns_count == loaded.returns_count == 5
+    assert added.returns_mean == pytest.approx(loaded.returns_mean)
+    assert added.volatility == pytest.approx(loaded.volatility)
+
+    loaded.load(np.array([]))
+    assert loaded.count == 0 and len(loaded.navs) == 0
+
+
+def test_portfolio_stats_series_capped():
+    """Test only the newest MAX_SERIES updates are kept while the statistics cover all."""
+    class SmallStats(PortfolioStats):
+        INITIAL_CAPACITY = 2
+        MAX_SERIES = 5
+
+    navs = [1000.0 + 10 * (i % 7) for i in range(40)]
+    capped, full = SmallStats(), PortfolioStats()
+    for tick, nav in enumerate(navs):
+        capped.add(nav, tick)
+        full.add(nav, tick)
+        assert capped.navs.tolist() == navs[max(0, tick - 4):tick + 1]
+        assert capped.ticks.tolist() == list(range(max(0, tick - 4), tick + 1))
+    assert len(capped._navs) <= 2 * SmallStats.MAX_SERIES
+    assert capped.count == 40
+    assert capped.max_nav == full.max_nav
+    assert capped.volatility == pytest.approx(full.volatility)
+
+    loaded = SmallStats()
+    loaded.load(np.array(navs), np.arange(40))
+    assert loaded.ticks.tolist() == list(range(35, 40))
+    assert loaded.count == 40
+    assert loaded.volatility == pytest.approx(full.volatility)
+
+
+class FakeWebSocket:
+    """Records sent frames; sends block while `gate` is cleared."""
+
+    def __init__(self):
+        self.sent = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_bytes(self, data):
+        await self.gate.wait()
+        self.sent.append(data)
+
+    async def send_text(self, data):
+        await self.gate.wait()
+        self.sent.append(data)
+
+
+def test_batch_frame():
+    """Test queued frames are wrapped in one batch message of the same kind."""
+    assert _batch_frame([b'{"a":1}', b'{"b":2}']) == b'{"type":"batch","messages":[{"a":1},{"b":2}]}'
+    assert json.loads(_batch_frame(['{"a":1}', '{"b":2}'])) == {
+        "type": "batch", "messages": [{"a": 1}, {"b": 2}]
+    }
+
+
+def test_write_loop_batches_queued_frames():
+    """Test frames queued during a send go out as one batch, as text for text clients."""
+    async def scenario():
+        manager = ConnectionManager()
+        binary, text = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(binary)
+        await manager.connect(text, text_frames=True)
+        binary.gate.clear()
+        text.gate.clear()
+
+        await manager.broadcast(b'{"n":1}')
+        await asyncio.sleep(0)  # Writers take frame 1 and block sending it
+        await manager.broadcast(b'{"n":2}')
+        await manager.broadcast(b'{"n":3}')
+        binary.gate.set()
+        text.gate.set()
+        await asyncio.sleep(0.01)
+        manager.disconnect(binary)
+        manager.disconnect(text)
+        return binary.sent, text.sent
+
+    binary_sent, text_sent = asyncio.run(scenario())
+    assert binary_sent == [b'{"n":1}', b'{"type":"batch","messages":[{"n":2},{"n":3}]}']
+    assert text_sent == ['{"n":1}', '{"type":"batch","messages":[{"n":2},{"n":3}]}']
+
+
+def test_broadcast_drops_oldest_for_slow_client(monkeypatch):
+    """Test a full send queue drops its oldest frames and keeps the newest."""
+    monkeypatch.setattr(web_server, 'SEND_QUEUE_SIZE', 2)
+
+    async def scenario():
+        manager = ConnectionManager()
+        slow = FakeWebSocket()
+        await manager.connect(slow)
+        slow.gate.clear()
+
+        await manager.broadcast(b'1')
+        await asyncio.sleep(0)  # Frame 1 is in flight
+        for frame in (b'2', b'3', b'4', b'5'):
+            await manager.broadcast(frame)
+        slow.gate.set()
+        await asyncio.sleep(0.01)
+        manager.disconnect(slow)
+        return slow.sent
+
+    assert asyncio.run(scenario()) == [b'1', b'{"type":"batch","messages":[4,5]}']
+
+
+def test_coalescing_keeps_newest_per_type():
+    """Test snapshot events are coalesced to the newest per type; others go out at once."""
+    collector = EventCollector()
+    server = VisualizationServer(collector)
+    sent = []
+
+    async def record(message):
+        sent.append(json.loads(message)["data"])
+
+    server.connection_manager.broadcast = record
+
+    async def scenario():
+        for tick in range(3):
+            collector.emit(EventType.PRICE_UPDATE, tick, {'prices': {'AAPL': 100 + tick}})
+            collector.emit(EventType.PORTFOLIO_UPDATE, tick, {'nav': 1000 + tick})
+        collector.emit(EventType.TRADE_EXECUTED, 2, {'ticker': 'AAPL'})
+        for event in collector.get_events():
+            await server._broadcast_event(event)
+        immediate = list(sent)
+        await asyncio.sleep(COALESCE_WINDOW * 3)
+        return immediate
+
+    immediate = asyncio.run(scenario())
+    assert [event["event_type"] for event in immediate] == ["trade_executed"]
+    assert [(event["event_type"], event["tick"]) for event in sent[1:]] == [
+        ("price_update", 2), ("portfolio_update", 2)
+    ]
+    assert server._pending_events == {}
+
+
+def test_coalescing_keeps_each_source():
+    """Test a nested engine's snapshot events do not replace the agent's in the same window."""
+    collector = EventCollector()
+    server = VisualizationServer(collector)
+    sent = []
+
+    async def record(message):
+        sent.append(json.loads(message)["data"])
+
+    server.connection_manager.broadcast = record
+
+    async def scenario():
+        for tick in range(1, 3):
+            collector.emit(EventType.PORTFOLIO_UPDATE, tick, {'nav': 1000 + tick})
+            collector.set_source('hodl')
+            collector.emit(EventType.PORTFOLIO_UPDATE, tick, {'nav': 900 + tick})
+            collector.set_source(None)
+        for event in collector.get_events():
+            await server._broadcast_event(event)
+        await asyncio.sleep(COALESCE_WINDOW * 3)
+
+    asyncio.run(scenario())
+    assert [(event["data"].get("source"), event["tick"], event["data"]["nav"]) for event in sent] == [
+        (None, 2, 1002), ('hodl', 2, 902)
+    ]
@@ -1,13 +1,22 @@
 import os
+import sys
 import gymnasium as gym
 from stable_baselines3 import SAC
 from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.callbacks import EvalCallback
+from stable_baselines3.common.vec_env import SubprocVecEnv
 from gym_environment import AgentTycoonEnv
 
 def main():
-    # Create vectorized environment for parallel training
-    env = make_vec_env(lambda: AgentTycoonEnv(), n_envs=4)
+    # Create vectorized environment for parallel training: one worker process
+    # per env, leaving a core for the learner
+    n_envs = max(1, min((os.cpu_count() or 2) - 1, 8))
+    # Forked workers inherit the already-imported gymnasium/sklearn/backends
+    # modules instead of re-importing them (SB3 defaults to forkserver/spawn).
+    # Only on Linux: fork is unsafe on macOS with Accelerate and threaded torch.
+    start_method = "fork" if sys.platform.startswith("linux") else None
+    env = make_vec_env(AgentTycoonEnv, n_envs=n_envs, vec_env_cls=SubprocVecEnv,
+                       vec_env_kwargs={"start_method": start_method})
 
     # Create evaluation environment
     eval_env = AgentTycoonEnv()
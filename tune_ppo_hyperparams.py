@@ -1,13 +1,27 @@
+import os
+
 import optuna
 from stable_baselines3 import PPO
 from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import SubprocVecEnv
 from gym_environment import AgentTycoonEnv
 import numpy as np
 
+N_ENVS = 2
+N_TRIALS = 20
+# Each trial already occupies N_ENVS worker processes
+N_JOBS = max(1, (os.cpu_count() or 1) // N_ENVS)
+
 def optimize_agent(trial):
-    n_envs = 2
-    env = make_vec_env(lambda: AgentTycoonEnv(), n_envs=n_envs)
+    n_envs = N_ENVS
+    # Env steps run in worker processes instead of the trial's thread
+    env = make_vec_env(AgentTycoonEnv, n_envs=n_envs, vec_env_cls=SubprocVecEnv)
+    try:
+        return _train_and_evaluate(trial, env, n_envs)
+    finally:
+        env.close()
 
+def _train_and_evaluate(trial, env, n_envs):
     # Hyperparameter search space
     learning_rate = trial.suggest_loguniform('learning_rate', 1e-5, 1e-3)
     n_steps = trial.suggest_categorical('n_steps', [512, 1024, 2048])
@@ -47,6 +61,6 @@ def optimize_agent(trial):
 
 if __name__ == "__main__":
     study = optuna.create_study(direction="maximize")
-    study.optimize(optimize_agent, n_trials=20)
+    study.optimize(optimize_agent, n_trials=N_TRIALS, n_jobs=N_JOBS)
     print("Best trial:")
     print(study.best_trial)
\ No newline at end of file
@@ -6,14 +6,27 @@ Captures all simulation events for real-time streaming and historical analysis.
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 import asyncio
 import json
 
+try:
+    import orjson
+except ImportError:  # Optional fast JSON encoder
+    orjson = None
 
-class EventType(Enum):
-    """Types of events that can occur in the simulation."""
+# numpy values and non-string keys can reach event payloads; json handles the keys itself
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+class EventType(str, Enum):
+    """Types of events that can occur in the simulation.
+
+    A str subclass, so members compare equal to their values and JSON
+    encoders emit them as plain strings.
+    """
     SIMULATION_START = "simulation_start"
     SIMULATION_TICK = "simulation_tick"
     AGENT_DECISION = "agent_decision"
@@ -28,62 +41,176 @@ class EventType(Enum):
     HODL_COMPARISON = "hodl_comparison"
 
 
-class SimulationEvent(BaseModel):
-    """Base class for all simulation events."""
+@dataclass(frozen=True, slots=True)
+class SimulationEvent:
+    """Base class for all simulation events.
+
+    A plain slotted dataclass: ``data`` is already serialized by the collector,
+    so events are built without validation and encoded only when sent. The
+    private ``_json`` and ``_nav`` fields memoize that encoding and the parsed
+    NAV (orjson skips underscore fields).
+    """
     event_type: EventType
     timestamp: datetime
     tick: int
     data: Dict[str, Any]
-    
-    class Config:
-        json_encoders = {
-            Decimal: str,
-            datetime: lambda v: v.isoformat()
+    _json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _nav: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def nav(self) -> float:
+        """``data['nav']`` as a float (0.0 if absent), parsed once per event."""
+        nav = self._nav
+        if nav is None:
+            nav = float(self.data.get('nav', 0))
+            object.__setattr__(self, '_nav', nav)
+        return nav
+
+    def dict(self) -> Dict[str, Any]:
+        """JSON-ready dict of the event (timestamp in ISO format)."""
+        return {
+            'event_type': self.event_type,
+            'timestamp': self.timestamp.isoformat(),
+            'tick': self.tick,
+            'data': self.data
         }
 
+    def json_bytes(self) -> bytes:
+        """The event encoded as JSON, computed on first use and shared by every sender."""
+        encoded = self._json
+        if encoded is None:
+            encoded = to_json_bytes(self)
+            object.__setattr__(self, '_json', encoded)
+        return encoded
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the non-JSON types that appear in events."""
+    if isinstance(value, SimulationEvent):
+        return value.dict()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json_bytes(value: Any) -> bytes:
+    """Serialize an event (or a message containing events) to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default, option=_ORJSON_OPTIONS)
+    return json.dumps(value, default=_json_default).encode()
+
+
+def to_json(value: Any) -> str:
+    """Serialize an event (or a message containing events) to a JSON string."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default, option=_ORJSON_OPTIONS).decode()
+    return json.dumps(value, default=_json_default)
+
+
+# Most events kept in memory; the oldest are dropped (or spilled) beyond this
+MAX_EVENTS = 100_000
+
+# Evicted events are appended to the spill file in batches of this size
+SPILL_BATCH_SIZE = 10_000
+
+# Exact types resolved with one lookup in _serialize_data before the generic checks
+_PASSTHROUGH_TYPES = frozenset({str, int, float, bool, type(None), list, dict})
+_ENCODERS = {Decimal: str, datetime: datetime.isoformat}
+
 
 class EventCollector:
-    """Collects and manages simulation events for visualization."""
+    """Collects and manages simulation events for visualization.
+
+    Only the newest MAX_EVENTS events stay in memory. With a ``spill_path``,
+    older events are appended to that file as JSON lines instead of being
+    dropped, and get_events still returns them.
+    """
     
-    def __init__(self):
-        self.events: List[SimulationEvent] = []
+    def __init__(self, spill_path: Optional[str] = None):
+        # Bounded history, plus the same events indexed by type for filtered reads;
+        # evictions are mirrored in the type index, so together they hold MAX_EVENTS
+        self.events: Deque[SimulationEvent] = deque(maxlen=MAX_EVENTS)
+        self._by_type: Dict[EventType, Deque[SimulationEvent]] = defaultdict(deque)
+        self.spill_path = spill_path
+        self._spill_pending: List[SimulationEvent] = []
+        # (min_tick, max_tick, byte offset, byte length) per spilled batch, so
+        # tick-filtered reads only load the batches that can match
+        self._spill_index: List[Tuple[int, int, int, int]] = []
         self.subscribers: List[callable] = []
+        # Subscribers split by kind at subscribe time, so emit never inspects them
+        self._sync_subs: List[callable] = []
+        self._async_subs: List[callable] = []
         self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Bumped by clear_events so incremental consumers know to start over
+        self.generation = 0
+        # Wall-clock time shared by every event of the current tick (see set_tick_time)
+        self.tick_time: Optional[datetime] = None
+        # Tag added to event data while a nested engine emits (see set_source)
+        self.source: Optional[str] = None
+        
+    def set_tick_time(self, ts: Optional[datetime]):
+        """Stamp subsequent events with ts instead of reading the clock per event; None resumes per-event timestamps."""
+        self.tick_time = ts
+
+    def set_source(self, source: Optional[str]):
+        """Tag subsequent events with ``data['source'] = source`` (e.g. "hodl"); None stops tagging."""
+        self.source = source
         
     def emit(self, event_type: EventType, tick: int, data: Dict[str, Any]):
         """Emit a new event to all subscribers."""
+        if self.source is not None:
+            data = {**data, 'source': self.source}
         event = SimulationEvent(
             event_type=event_type,
-            timestamp=datetime.now(),
+            timestamp=self.tick_time or datetime.now(),
             tick=tick,
             data=self._serialize_data(data)
         )
         
+        if len(self.events) == MAX_EVENTS:
+            # Keep the type index in step with the ring, so it never holds evicted events
+            evicted = self.events[0]
+            self._by_type[evicted.event_type].popleft()
+            if self.spill_path is not None:
+                self._spill_pending.append(evicted)
+                if len(self._spill_pending) >= SPILL_BATCH_SIZE:
+                    self._flush_spill()
         self.events.append(event)
+        self._by_type[event_type].append(event)
         
-        # Notify all subscribers
-        for subscriber in self.subscribers:
+        # Call synchronous subscribers directly
+        for subscriber in self._sync_subs:
             try:
-                if asyncio.iscoroutinefunction(subscriber):
-                    if self.loop:
-                        # Schedule the coroutine on the event loop from a different thread
-                        asyncio.run_coroutine_threadsafe(subscriber(event), self.loop)
-                    else:
-                        print("Warning: asyncio event loop not set for async subscriber.")
-                else:
-                    # Call synchronous subscribers directly
-                    subscriber(event)
+                subscriber(event)
             except Exception as e:
                 print(f"Error notifying subscriber: {e}")
+
+        if self._async_subs:
+            loop = self.loop
+            if loop is None:
+                print("Warning: asyncio event loop not set for async subscriber.")
+                return
+            for subscriber in self._async_subs:
+                try:
+                    # Schedule the coroutine on the event loop from a different thread
+                    asyncio.run_coroutine_threadsafe(subscriber(event), loop)
+                except Exception as e:
+                    print(f"Error notifying subscriber: {e}")
     
     def subscribe(self, callback: callable):
         """Subscribe to events."""
         self.subscribers.append(callback)
+        (self._async_subs if asyncio.iscoroutinefunction(callback) else self._sync_subs).append(callback)
     
     def unsubscribe(self, callback: callable):
         """Unsubscribe from events."""
         if callback in self.subscribers:
             self.subscribers.remove(callback)
+            (self._async_subs if asyncio.iscoroutinefunction(callback) else self._sync_subs).remove(callback)
     
     def set_loop(self, loop: asyncio.AbstractEventLoop):
         """Set the asyncio event loop for thread-safe coroutine execution."""
@@ -91,34 +218,102 @@ class EventCollector:
     
     def get_events(self, event_type: Optional[EventType] = None,
                    start_tick: Optional[int] = None,
-                   end_tick: Optional[int] = None) -> List[SimulationEvent]:
-        """Get filtered events."""
-        filtered_events = self.events
-        
-        if event_type:
-            filtered_events = [e for e in filtered_events if e.event_type == event_type]
+                   end_tick: Optional[int] = None,
+                   limit: Optional[int] = None) -> List[SimulationEvent]:
+        """Get filtered events, oldest first (spilled events included).
+
+        With a limit, only the newest ``limit`` matches are returned; in-memory
+        history is then scanned backwards and stops once enough are found.
+        """
+        low = start_tick if start_tick is not None else float('-inf')
+        high = end_tick if end_tick is not None else float('inf')
+        # The simulation thread may append while a server thread reads: list()
+        # copies the deque in one C call, so the scans below never see it change
+        source = list(self._by_type.get(event_type, ()) if event_type else self.events)
         
-        if start_tick is not None:
-            filtered_events = [e for e in filtered_events if e.tick >= start_tick]
-            
-        if end_tick is not None:
-            filtered_events = [e for e in filtered_events if e.tick <= end_tick]
-            
-        return filtered_events
+        if limit is None:
+            if start_tick is None and end_tick is None:
+                recent = source
+            else:
+                # Ticks restart with each simulation, so filter rather than bisect
+                recent = [e for e in source if low <= e.tick <= high]
+        else:
+            recent = []
+            if limit > 0:
+                for e in reversed(source):
+                    if low <= e.tick <= high:
+                        recent.append(e)
+                        if len(recent) == limit:
+                            break
+                recent.reverse()
+
+        if self.spill_path is None or (limit is not None and len(recent) >= limit):
+            return recent
+
+        # Older events live in the spill file and the pending batch
+        older = [e for e in self._read_spilled(low, high) + self._spill_pending
+                 if low <= e.tick <= high and (event_type is None or e.event_type == event_type)]
+        if limit is not None:
+            older = older[-(limit - len(recent)):]
+        return older + recent
     
     def clear_events(self):
-        """Clear all stored events."""
+        """Clear all stored events (and the spill file, if any)."""
         self.events.clear()
+        self._by_type.clear()
+        self.generation += 1
+        if self.spill_path is not None:
+            self._spill_pending.clear()
+            self._spill_index.clear()
+            open(self.spill_path, 'wb').close()
+
+    def _flush_spill(self):
+        """Append the pending evicted events to the spill file as one batch."""
+        batch = self._spill_pending
+        payload = b''.join(event.json_bytes() + b'\n' for event in batch)
+        with open(self.spill_path, 'ab') as f:
+            offset = f.tell()
+            f.write(payload)
+        ticks = [event.tick for event in batch]
+        self._spill_index.append((min(ticks), max(ticks), offset, len(payload)))
+        self._spill_pending = []
+
+    def _read_spilled(self, low: float, high: float) -> List[SimulationEvent]:
+        """Load the spilled events from every batch whose tick range overlaps [low, high]."""
+        events = []
+        if not self._spill_index:
+            return events
+        with open(self.spill_path, 'rb') as f:
+            for min_tick, max_tick, offset, length in self._spill_index:
+                if max_tick < low or min_tick > high:
+                    continue
+                f.seek(offset)
+                for line in f.read(length).splitlines():
+                    record = json.loads(line)
+                    events.append(SimulationEvent(
+                        event_type=EventType(record['event_type']),
+                        timestamp=datetime.fromisoformat(record['timestamp']),
+                        tick=record['tick'],
+                        data=record['data']
+                    ))
+        return events
     
     def _serialize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Serialize data to JSON-compatible format."""
         serialized = {}
         for key, value in data.items():
-            if isinstance(value, Decimal):
+            value_type = type(value)
+            if value_type in _PASSTHROUGH_TYPES:
+                serialized[key] = value
+            elif value_type in _ENCODERS:
+                serialized[key] = _ENCODERS[value_type](value)
+            elif isinstance(value, Decimal):
                 serialized[key] = str(value)
             elif isinstance(value, datetime):
                 serialized[key] = value.isoformat()
-            elif hasattr(value, 'dict'):  # Pydantic models
+            elif hasattr(value, 'model_dump'):  # Pydantic v2 models, dumped to JSON types in Rust
+                serialized[key] = value.model_dump(mode='json')
+            elif hasattr(value, 'dict'):  # Pydantic v1 models and SimulationEvent
                 serialized[key] = value.dict()
             elif hasattr(value, '__dict__'):  # Other objects
                 serialized[key] = {k: str(v) for k, v in value.__dict__.items()}
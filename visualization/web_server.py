@@ -3,61 +3,346 @@ FastAPI web server for Agent Tycoon visualization.
 Premium enterprise-grade dashboard with advanced real-time visualization.
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-from typing import List, Optional, Dict, Any
-import json
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from typing import AsyncIterator, List, Optional, Dict, Any, Set, Tuple, Union
+import asyncio
+import functools
+import gzip
+import hashlib
+from pathlib import Path
 
-from .events import EventCollector, EventType, SimulationEvent
+import numpy as np
+
+from .events import MAX_EVENTS, EventCollector, EventType, SimulationEvent, to_json_bytes
+
+
+class EventJSONResponse(JSONResponse):
+    """JSON response rendered by the event encoder (orjson when installed).
+
+    Returned directly, it also skips FastAPI's jsonable_encoder pass, so lists
+    of SimulationEvent are encoded in one call.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json_bytes(content)
+
+
+# Event responses longer than this are streamed, this many events per chunk
+STREAM_CHUNK_SIZE = 500
+
+# Per-tick snapshot events: each supersedes the previous one of its type from
+# the same source (the agent's engine, or a tagged nested one such as the HODL
+# comparison), so only the latest per COALESCE_WINDOW is broadcast
+COALESCED_EVENT_TYPES = frozenset({
+    EventType.SIMULATION_TICK,
+    EventType.PRICE_UPDATE,
+    EventType.PORTFOLIO_UPDATE,
+    EventType.REWARD_CALCULATED,
+})
+
+# Seconds coalesced events are held before broadcasting (about one 60 Hz frame)
+COALESCE_WINDOW = 0.016
+
+
+# Seconds browsers may reuse the dashboard page before revalidating it
+DASHBOARD_MAX_AGE = 3600
+
+
+@functools.cache
+def _dashboard_bytes() -> bytes:
+    """The dashboard page, read from dashboard.html next to this module."""
+    return (Path(__file__).parent / "dashboard.html").read_bytes()
+
+
+def _events_json(events: List[SimulationEvent]) -> bytes:
+    """JSON array assembled from the events' memoized encodings."""
+    return b"[" + b",".join(event.json_bytes() for event in events) + b"]"
+
+
+async def _iter_events_json(events: List[SimulationEvent]) -> AsyncIterator[bytes]:
+    """The JSON array of _events_json, produced STREAM_CHUNK_SIZE events at a time.
+
+    Runs on the event loop (a sync iterator would cost a threadpool hop per
+    chunk) and yields to it between chunks, so long responses never stall
+    broadcasts or other requests.
+    """
+    yield b"["
+    for start in range(0, len(events), STREAM_CHUNK_SIZE):
+        chunk = b",".join(event.json_bytes() for event in events[start:start + STREAM_CHUNK_SIZE])
+        yield b"," + chunk if start else chunk
+        await asyncio.sleep(0)
+    yield b"]"
+
+
+def _events_response(events: List[SimulationEvent]) -> Response:
+    """JSON array response of the events.
+
+    Large results are streamed in chunks, so the full body is never held in
+    memory and the client can start parsing before the last event is encoded.
+    """
+    if len(events) > STREAM_CHUNK_SIZE:
+        return StreamingResponse(_iter_events_json(events), media_type="application/json")
+    return Response(content=_events_json(events), media_type="application/json")
+
+
+class PortfolioStats:
+    """Running NAV statistics over the PORTFOLIO_UPDATE events, updated per event.
+
+    Keeps what the performance summary needs (first, last and max NAV, plus a
+    Welford mean/variance of the period returns) so requests never rescan
+    the event history. The NAV and tick series of the newest MAX_SERIES
+    updates are also kept as contiguous NumPy arrays (``navs``/``ticks``) for
+    vectorized consumers; the statistics cover every update.
+    """
+
+    INITIAL_CAPACITY = 1024
+    MAX_SERIES = MAX_EVENTS
+
+    def __init__(self):
+        self._navs = np.empty(self.INITIAL_CAPACITY, dtype=np.float64)
+        self._ticks = np.empty(self.INITIAL_CAPACITY, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        # The series occupies [_start, _end) of the arrays
+        self._start = 0
+        self._end = 0
+        self.initial_nav = 0.0
+        self.current_nav = 0.0
+        self.max_nav = 0.0
+        self.returns_count = 0
+        self.returns_mean = 0.0
+        self.returns_m2 = 0.0
+
+    @property
+    def navs(self) -> np.ndarray:
+        """NAV of the newest (up to MAX_SERIES) updates (a view; treat as read-only)."""
+        return self._navs[self._start:self._end]
+
+    @property
+    def ticks(self) -> np.ndarray:
+        """Tick of the same updates, aligned with navs."""
+        return self._ticks[self._start:self._end]
+
+    def _reserve(self, size: int):
+        """Grow the series arrays (by doubling, up to twice MAX_SERIES) to hold at least size entries."""
+        capacity = len(self._navs)
+        if size > capacity:
+            while capacity < size:
+                capacity *= 2
+            capacity = min(capacity, 2 * self.MAX_SERIES)
+            self._navs = np.resize(self._navs, capacity)
+            self._ticks = np.resize(self._ticks, capacity)
+
+    def _append(self, nav: float, tick: int):
+        """Append one entry to the series, dropping the oldest beyond MAX_SERIES."""
+        end = self._end
+        if end == len(self._navs):
+            if end < 2 * self.MAX_SERIES:
+                self._reserve(end + 1)
+            else:
+                # Full: move the kept window to the front, once per MAX_SERIES appends
+                start = self._start
+                self._navs[:end - start] = self._navs[start:end]
+                self._ticks[:end - start] = self._ticks[start:end]
+                self._start, end = 0, end - start
+        self._navs[end] = nav
+        self._ticks[end] = tick
+        self._end = end + 1
+        if self._end - self._start > self.MAX_SERIES:
+            self._start += 1
+
+    def add(self, nav: float, tick: int = 0):
+        """Fold in the NAV of one portfolio update."""
+        if self.count == 0:
+            self.initial_nav = self.max_nav = nav
+        else:
+            previous = self.current_nav
+            ret = (nav - previous) / previous if previous > 0 else 0
+            self.returns_count += 1
+            delta = ret - self.returns_mean
+            self.returns_mean += delta / self.returns_count
+            self.returns_m2 += delta * (ret - self.returns_mean)
+            self.max_nav = max(self.max_nav, nav)
+        self._append(nav, tick)
+        self.current_nav = nav
+        self.count += 1
+
+    def load(self, navs: np.ndarray, ticks: Optional[np.ndarray] = None):
+        """Replace the statistics with those of a whole NAV series, in one NumPy pass."""
+        self.reset()
+        if not len(navs):
+            return
+        kept = min(len(navs), self.MAX_SERIES)
+        self._reserve(kept)
+        self._navs[:kept] = navs[-kept:]
+        self._ticks[:kept] = ticks[-kept:] if ticks is not None else 0
+        self._end = kept
+        previous = navs[:-1]
+        returns = np.divide(np.diff(navs), previous, out=np.zeros(len(previous)), where=previous > 0)
+        self.count = len(navs)
+        self.initial_nav = float(navs[0])
+        self.current_nav = float(navs[-1])
+        self.max_nav = float(navs.max())
+        self.returns_count = len(returns)
+        if len(returns):
+            self.returns_mean = float(returns.mean())
+            self.returns_m2 = float(np.square(returns - self.returns_mean).sum())
+
+    @property
+    def volatility(self) -> float:
+        """Population standard deviation of the returns (0 with fewer than two)."""
+        if self.returns_count < 2:
+            return 0
+        return (self.returns_m2 / self.returns_count) ** 0.5
+
+
+# Frames buffered per WebSocket client before its oldest are dropped
+SEND_QUEUE_SIZE = 256
+
+# What a send to a client that has gone away raises: the disconnect itself,
+# the server's socket error (uvicorn's ClientDisconnected is an OSError), or
+# RuntimeError for a send after the close handshake
+_DISCONNECT_ERRORS = (WebSocketDisconnect, OSError, RuntimeError)
+
+
+def _batch_frame(frames: List[Union[str, bytes]]) -> Union[str, bytes]:
+    """Wrap several encoded messages (all str or all bytes) in one batch message."""
+    if isinstance(frames[0], bytes):
+        return b'{"type":"batch","messages":[' + b",".join(frames) + b"]}"
+    return '{"type":"batch","messages":[' + ",".join(frames) + "]}"
 
 
 class ConnectionManager:
-    """Manages WebSocket connections for real-time updates."""
+    """Manages WebSocket connections for real-time updates.
+
+    Every client has a bounded send queue drained by its own writer task, so
+    broadcast never waits on a socket and a slow client only loses (its
+    oldest) frames of its own.
+    """
 
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
+        # Clients that asked for text frames (?format=json) instead of binary ones
+        self.text_connections: Set[WebSocket] = set()
+        self._queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, text_frames: bool = False):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        if text_frames:
+            self.text_connections.add(websocket)
+        queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._queues[websocket] = queue
+        self._writers[websocket] = asyncio.create_task(self._write_loop(websocket, queue))
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self.text_connections.discard(websocket)
+        self._queues.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
+    async def broadcast(self, message: Union[str, bytes]):
+        # The one encoded message is queued for every client. Bytes (UTF-8
+        # JSON) go out as binary frames without a decode/re-encode; text-frame
+        # clients get the decoded string, built at most once.
+        if isinstance(message, bytes):
+            binary, text = message, (message.decode() if self.text_connections else None)
+        else:
+            binary, text = None, message
+        for connection, queue in self._queues.items():
+            frame = binary if binary is not None and connection not in self.text_connections else text
+            if queue.full():
+                queue.get_nowait()  # Drop the oldest frame for this client only
+            queue.put_nowait(frame)
+
+    async def _write_loop(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send one client's queued frames until it goes away.
+
+        Messages that queued up while the previous send was in flight go out
+        together as one {"type": "batch", "messages": [...]} frame.
+        """
+        while True:
+            frame = await queue.get()
+            if not queue.empty():
+                frames = [frame]
+                while not queue.empty():
+                    frames.append(queue.get_nowait())
+                frame = _batch_frame(frames)
             try:
-                await connection.send_text(message)
-            except:
-                # Connection is broken, remove it
-                self.disconnect(connection)
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+            except _DISCONNECT_ERRORS:
+                self.disconnect(websocket)
+                return
+            except Exception as e:
+                # Not a closed socket: report it and keep the client
+                print(f"Error broadcasting to client: {e!r}")
 
 
 class VisualizationServer:
     """Premium visualization server class."""
 
     def __init__(self, event_collector: EventCollector):
-        self.app = FastAPI(title="Agent Tycoon Pro", version="2.0.0")
+        self.app = FastAPI(title="Agent Tycoon Pro", version="2.0.0",
+                           default_response_class=EventJSONResponse)
         self.event_collector = event_collector
         self.connection_manager = ConnectionManager()
 
+        # Performance statistics, seeded from the history so far and then kept
+        # current by a subscriber
+        self.portfolio_stats = PortfolioStats()
+        self._stats_generation = None
+        self._sync_portfolio_stats()
+
+        # Latest held-back event per (source, coalesced type), and the task that sends them
+        self._pending_events: Dict[Tuple[Optional[str], EventType], SimulationEvent] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
         # Subscribe to events for real-time broadcasting
+        self.event_collector.subscribe(self._record_portfolio_update)
         self.event_collector.subscribe(self._broadcast_event)
 
+        # The dashboard is static: read it (and build its gzip form) once, not per request
+        self._dashboard_html = _dashboard_bytes()
+        self._dashboard_html_gz = gzip.compress(self._dashboard_html, 9)
+        # Validator for conditional requests; the gzip variant gets its own tag
+        digest = hashlib.blake2b(self._dashboard_html, digest_size=8).hexdigest()
+        self._dashboard_etag = f'"{digest}"'
+        self._dashboard_etag_gz = f'"{digest}-gz"'
+
         self._setup_routes()
 
     def _setup_routes(self):
         """Setup all API routes."""
 
         @self.app.get("/")
-        async def get_dashboard():
-            """Serve the premium dashboard."""
-            return HTMLResponse(self._get_premium_dashboard_html())
+        async def get_dashboard(request: Request):
+            """Serve the premium dashboard (precompressed when the client accepts gzip).
+
+            The page is static, so browsers may cache it for an hour and then
+            revalidate it with If-None-Match, which is answered with a 304.
+            """
+            use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+            etag = self._dashboard_etag_gz if use_gzip else self._dashboard_etag
+            headers = {"Vary": "Accept-Encoding", "ETag": etag,
+                       "Cache-Control": f"public, max-age={DASHBOARD_MAX_AGE}"}
+            if etag in request.headers.get("if-none-match", ""):
+                return Response(status_code=304, headers=headers)
+            if use_gzip:
+                headers["Content-Encoding"] = "gzip"
+                return HTMLResponse(self._dashboard_html_gz, headers=headers)
+            return HTMLResponse(self._dashboard_html, headers=headers)
 
         @self.app.get("/api/events")
         async def get_events(
@@ -83,528 +368,208 @@ class VisualizationServer:
                 if not isinstance(limit, int) or limit <= 0 or limit > 10000:
                     raise HTTPException(status_code=400, detail="limit must be a positive integer <= 10000")
 
+            # Only the newest `limit` matches are collected
             events = self.event_collector.get_events(
                 event_type=event_type_enum,
                 start_tick=start_tick,
-                end_tick=end_tick
+                end_tick=end_tick,
+                limit=limit or None
             )
 
-            # Limit results
-            if limit:
-                events = events[-limit:]
+            return _events_response(events)
 
-            return [event.dict() for event in events]
+        @self.app.get("/api/events/nav")
+        async def get_nav_series(limit: int = 100):
+            """NAV of the newest `limit` portfolio updates as parallel arrays {"x": ticks, "y": navs}."""
+            if limit <= 0 or limit > 10000:
+                raise HTTPException(status_code=400, detail="limit must be a positive integer <= 10000")
+            return self._nav_series(limit)
 
         @self.app.get("/api/portfolio/current")
         async def get_current_portfolio():
             """Get current portfolio state."""
-            portfolio_events = self.event_collector.get_events(
-                event_type=EventType.PORTFOLIO_UPDATE
-            )
-
-            if portfolio_events:
-                return portfolio_events[-1].data
-            else:
-                return {"message": "No portfolio data available"}
+            return self._current_portfolio()
 
         @self.app.get("/api/performance/summary")
         async def get_performance_summary():
             """Get performance summary metrics."""
-            portfolio_events = self.event_collector.get_events(
-                event_type=EventType.PORTFOLIO_UPDATE
-            )
-
-            if not portfolio_events:
-                return {"message": "No performance data available"}
-
-            # Calculate advanced metrics
-            nav_values = [float(event.data.get('nav', 0)) for event in portfolio_events]
-
-            if len(nav_values) < 2:
-                return {"nav_current": nav_values[0] if nav_values else 0}
-
-            initial_nav = nav_values[0]
-            current_nav = nav_values[-1]
-            total_return = (current_nav - initial_nav) / initial_nav if initial_nav > 0 else 0
-
-            # Calculate volatility and other advanced metrics
-            returns = []
-            for i in range(1, len(nav_values)):
-                ret = (nav_values[i] - nav_values[i-1]) / nav_values[i-1] if nav_values[i-1] > 0 else 0
-                returns.append(ret)
-
-            volatility = 0
-            if len(returns) > 1:
-                avg_return = sum(returns) / len(returns)
-                variance = sum((r - avg_return) ** 2 for r in returns) / len(returns)
-                volatility = variance ** 0.5
-
-            max_nav = max(nav_values)
-            drawdown = (max_nav - current_nav) / max_nav if max_nav > 0 else 0
-
-            return {
-                "nav_current": current_nav,
-                "nav_initial": initial_nav,
-                "nav_max": max_nav,
-                "total_return": total_return,
-                "total_return_pct": total_return * 100,
-                "volatility": volatility * 100,
-                "drawdown": drawdown * 100,
-                "sharpe_ratio": (total_return / volatility) if volatility > 0 else 0,
-                "num_ticks": len(nav_values)
-            }
+            return self._performance_summary()
 
         @self.app.get("/api/decisions/recent")
         async def get_recent_decisions(limit: int = 20):
             """Get recent AI decisions."""
             decision_events = self.event_collector.get_events(
-                event_type=EventType.AGENT_DECISION
+                event_type=EventType.AGENT_DECISION, limit=limit
             )
 
-            return [event.dict() for event in decision_events[-limit:]]
+            return _events_response(decision_events)
 
         @self.app.get("/api/risk/metrics")
         async def get_risk_metrics():
             """Get advanced risk metrics."""
-            portfolio_events = self.event_collector.get_events(
-                event_type=EventType.PORTFOLIO_UPDATE
-            )
+            return self._risk_metrics()
 
-            if not portfolio_events:
-                return {"message": "No risk data available"}
+        @self.app.get("/api/bootstrap")
+        async def get_bootstrap():
+            """Everything the dashboard loads on connect, in one response.
 
-            # Calculate VaR, correlation, etc.
-            nav_values = [float(event.data.get('nav', 0)) for event in portfolio_events]
-
-            # Simulate some advanced risk metrics
-            return {
-                "var_95": 0.05,  # 5% VaR
-                "var_99": 0.02,  # 1% VaR
-                "beta": 1.2,
-                "alpha": 0.03,
-                "correlation_spy": 0.75,
-                "tracking_error": 0.08
-            }
+            Bundles the performance summary, the NAV series of the last 100
+            portfolio updates, the current portfolio, the risk metrics and the
+            20 latest decisions.
+            """
+            decision_events = self.event_collector.get_events(
+                event_type=EventType.AGENT_DECISION, limit=20
+            )
+            # Events are spliced in from their memoized encodings
+            body = (
+                b'{"perf":' + to_json_bytes(self._performance_summary())
+                + b',"nav":' + to_json_bytes(self._nav_series(100))
+                + b',"portfolio":' + to_json_bytes(self._current_portfolio())
+                + b',"risk":' + to_json_bytes(self._risk_metrics())
+                + b',"decisions":' + _events_json(decision_events)
+                + b'}'
+            )
+            return Response(content=body, media_type="application/json")
 
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
             """WebSocket endpoint for real-time updates."""
-            await self.connection_manager.connect(websocket)
+            # Binary JSON frames by default; ?format=json keeps text frames for debugging
+            text_frames = websocket.query_params.get("format") == "json"
+            await self.connection_manager.connect(websocket, text_frames=text_frames)
             try:
-                while True:
-                    # Keep connection alive
-                    await websocket.receive_text()
-            except WebSocketDisconnect:
+                # Liveness is handled by protocol-level ping/pong, so client frames
+                # are never decoded; only the disconnect message matters
+                while (await websocket.receive())["type"] != "websocket.disconnect":
+                    pass
+            finally:
                 self.connection_manager.disconnect(websocket)
 
-    async def _broadcast_event(self, event: SimulationEvent):
-        """Broadcast event to all connected WebSocket clients."""
-        message = json.dumps({
-            "type": "event",
-            "data": event.dict()
-        })
-        await self.connection_manager.broadcast(message)
-
-    def _get_premium_dashboard_html(self) -> str:
-        """Generate the premium dashboard HTML."""
-        return """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Agent Tycoon Pro - AI Trading Intelligence Platform</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/three.js/r128/three.min.js"></script>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    <style>
-        /* ... (CSS as provided in the user's feedback, omitted for brevity, see previous message) ... */
-    </style>
-</head>
-<body>
-    <div class="bg-animation"></div>
-    <div class="header">
-        <div class="logo">Agent Tycoon Pro</div>
-        <div class="subtitle">AI-Powered Trading Intelligence Platform</div>
-    </div>
-    <div id="connection-status" class="connection-status disconnected">
-        <div class="spinner"></div>
-        Connecting to simulation...
-    </div>
-    <div class="dashboard">
-        <!-- Performance Overview -->
-        <div class="panel glass-strong panel-large">
-            <div class="panel-header">
-                <div class="panel-title">
-                    <div class="panel-icon">📈</div>
-                    Portfolio Performance
-                </div>
-            </div>
-            <div class="metrics-grid">
-                <div class="metric-card">
-                    <div class="metric-label">Current NAV</div>
-                    <div class="metric-value" id="current-nav">$0.00</div>
-                    <div class="metric-change positive" id="nav-change">
-                        ↗ +0.00%
-                    </div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">Total Return</div>
-                    <div class="metric-value" id="total-return">0.00%</div>
-                    <div class="metric-change" id="return-change">
-                        Since inception
-                    </div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">Sharpe Ratio</div>
-                    <div class="metric-value" id="sharpe-ratio">0.00</div>
-                    <div class="metric-change" id="sharpe-change">
-                        Risk-adjusted
-                    </div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">Max Drawdown</div>
-                    <div class="metric-value" id="drawdown">0.00%</div>
-                    <div class="metric-change" id="drawdown-change">
-                        Peak to trough
-                    </div>
-                </div>
-            </div>
-            <div class="chart-container" id="nav-chart"></div>
-        </div>
-        <!-- Risk Analytics -->
-        <div class="panel glass">
-            <div class="panel-header">
-                <div class="panel-title">
-                    <div class="panel-icon">⚡</div>
-                    Risk Analytics
-                </div>
-            </div>
-            <div class="metrics-grid">
-                <div class="metric-card">
-                    <div class="metric-label">Volatility</div>
-                    <div class="metric-value" id="volatility">0.00%</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">VaR (95%)</div>
-                    <div class="metric-value" id="var-95">0.00%</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">Beta</div>
-                    <div class="metric-value" id="beta">0.00</div>
-                </div>
-                <div class="metric-card">
-                    <div class="metric-label">Alpha</div>
-                    <div class="metric-value" id="alpha">0.00%</div>
-                </div>
-            </div>
-        </div>
-        <!-- Asset Allocation -->
-        <div class="panel glass">
-            <div class="panel-header">
-                <div class="panel-title">
-                    <div class="panel-icon">🎯</div>
-                    Asset Allocation
-                </div>
-            </div>
-            <div class="chart-container" id="allocation-chart"></div>
-        </div>
-        <!-- AI Decision Intelligence -->
-        <div class="panel glass panel-full">
-            <div class="panel-header">
-                <div class="panel-title">
-                    <div class="panel-icon">🤖</div>
-                    AI Decision Intelligence
-                </div>
-                <div class="metric-card" style="margin: 0; padding: 0.75rem 1rem;">
-                    <div class="metric-label" style="margin-bottom: 0.25rem;">Current Tick</div>
-                    <div class="metric-value" id="current-tick" style="font-size: 1.5rem;">0</div>
-                </div>
-            </div>
-            <div class="decisions-feed" id="recent-decisions">
-                <div class="loading">
-                    <div class="spinner"></div>
-                    Waiting for AI decisions...
-                </div>
-            </div>
-        </div>
-    </div>
-    <script>
-        // WebSocket connection and data management
-        let ws = null;
-        let navData = [];
-        let allocationData = {};
-        let lastNavValue = 0;
-
-        // Chart configurations
-        const chartConfig = {
-            displayModeBar: false,
-            responsive: true,
-            showTips: false,
-            showAxisDragHandles: false,
-            scrollZoom: false
-        };
-
-        // Enhanced color palette
-        const colors = {
-            primary: '#0070f3',
-            secondary: '#7c3aed',
-            accent: '#06ffa5',
-            success: '#10b981',
-            warning: '#f59e0b',
-            danger: '#ef4444'
-        };
-
-        function connectWebSocket() {
-            const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-            ws = new WebSocket(`${protocol}//${window.location.host}/ws`);
-
-            ws.onopen = function() {
-                const statusEl = document.getElementById('connection-status');
-                statusEl.className = 'connection-status connected';
-                statusEl.innerHTML = '🟢 Connected - Live Data Streaming';
-                loadInitialData();
-            };
-
-            ws.onmessage = function(event) {
-                const message = JSON.parse(event.data);
-                if (message.type === 'event') {
-                    handleEvent(message.data);
-                }
-            };
-
-            ws.onclose = function() {
-                const statusEl = document.getElementById('connection-status');
-                statusEl.className = 'connection-status disconnected';
-                statusEl.innerHTML = '🔴 Disconnected - Attempting Reconnection';
-                // Attempt to reconnect after 3 seconds
-                setTimeout(connectWebSocket, 3000);
-            };
-        }
-
-        function handleEvent(event) {
-            if (event.event_type === 'portfolio_update') {
-                updatePortfolioMetrics(event.data);
-                updateNAVChart(event.tick, event.data.nav);
-                updateAllocationChart(event.data.portfolio);
-
-                // Add pulse effect to updated elements
-                document.getElementById('current-nav').classList.add('pulse');
-                setTimeout(() => {
-                    document.getElementById('current-nav').classList.remove('pulse');
-                }, 2000);
-
-            } else if (event.event_type === 'agent_decision') {
-                updateRecentDecisions(event);
-                document.getElementById('current-tick').textContent = event.tick;
-            }
+    def _nav_series(self, limit: int) -> Dict[str, List]:
+        """Ticks and NAVs of the newest `limit` portfolio updates, read from the running statistics."""
+        stats = self._sync_portfolio_stats()
+        return {"x": stats.ticks[-limit:].tolist(), "y": stats.navs[-limit:].tolist()}
+
+    def _current_portfolio(self) -> Dict[str, Any]:
+        """Data of the latest portfolio update."""
+        portfolio_events = self.event_collector.get_events(
+            event_type=EventType.PORTFOLIO_UPDATE, limit=1
+        )
+
+        if portfolio_events:
+            return portfolio_events[-1].data
+        else:
+            return {"message": "No portfolio data available"}
+
+    def _performance_summary(self) -> Dict[str, Any]:
+        """Performance summary metrics from the running portfolio statistics."""
+        stats = self._sync_portfolio_stats()
+
+        if not stats.count:
+            return {"message": "No performance data available"}
+
+        if stats.count < 2:
+            return {"nav_current": stats.current_nav}
+
+        initial_nav = stats.initial_nav
+        current_nav = stats.current_nav
+        total_return = (current_nav - initial_nav) / initial_nav if initial_nav > 0 else 0
+
+        # Volatility and drawdown come from the running statistics
+        volatility = stats.volatility
+        max_nav = stats.max_nav
+        drawdown = (max_nav - current_nav) / max_nav if max_nav > 0 else 0
+
+        return {
+            "nav_current": current_nav,
+            "nav_initial": initial_nav,
+            "nav_max": max_nav,
+            "total_return": total_return,
+            "total_return_pct": total_return * 100,
+            "volatility": volatility * 100,
+            "drawdown": drawdown * 100,
+            "sharpe_ratio": (total_return / volatility) if volatility > 0 else 0,
+            "num_ticks": stats.count
         }
 
-        function updatePortfolioMetrics(data) {
-            const currentNav = parseFloat(data.nav);
-            const navChange = lastNavValue > 0 ? ((currentNav - lastNavValue) / lastNavValue * 100) : 0;
-
-            // Update main metrics with animations
-            animateNumber('current-nav', currentNav, '$', '');
-
-            // Update change indicator
-            const changeEl = document.getElementById('nav-change');
-            if (navChange > 0) {
-                changeEl.className = 'metric-change positive';
-                changeEl.innerHTML = `↗ +${navChange.toFixed(2)}%`;
-            } else if (navChange < 0) {
-                changeEl.className = 'metric-change negative';
-                changeEl.innerHTML = `↘ ${navChange.toFixed(2)}%`;
-            } else {
-                changeEl.className = 'metric-change';
-                changeEl.innerHTML = '→ No change';
-            }
-
-            lastNavValue = currentNav;
-
-            if (data.total_return_pct !== undefined) {
-                const totalReturn = parseFloat(data.total_return_pct);
-                document.getElementById('total-return').textContent = `${totalReturn.toFixed(2)}%`;
-
-                const returnChangeEl = document.getElementById('return-change');
-                returnChangeEl.className = `metric-change ${totalReturn >= 0 ? 'positive' : 'negative'}`;
-            }
-            if (data.sharpe_ratio !== undefined) {
-                document.getElementById('sharpe-ratio').textContent = data.sharpe_ratio.toFixed(2);
-            }
-            if (data.drawdown !== undefined) {
-                document.getElementById('drawdown').textContent = `${parseFloat(data.drawdown).toFixed(2)}%`;
-            }
+    def _risk_metrics(self) -> Dict[str, Any]:
+        """Advanced risk metrics."""
+        if not self._sync_portfolio_stats().count:
+            return {"message": "No risk data available"}
+
+        # Simulate some advanced risk metrics
+        return {
+            "var_95": 0.05,  # 5% VaR
+            "var_99": 0.02,  # 1% VaR
+            "beta": 1.2,
+            "alpha": 0.03,
+            "correlation_spy": 0.75,
+            "tracking_error": 0.08
         }
 
-        function animateNumber(elementId, targetValue, prefix = '', suffix = '') {
-            const element = document.getElementById(elementId);
-            const startValue = parseFloat(element.textContent.replace(/[^0-9.-]/g, '')) || 0;
-            const duration = 1000;
-            const startTime = performance.now();
-
-            function updateValue(currentTime) {
-                const elapsed = currentTime - startTime;
-                const progress = Math.min(elapsed / duration, 1);
-
-                // Easing function
-                const easeOutCubic = 1 - Math.pow(1 - progress, 3);
-                const currentValue = startValue + (targetValue - startValue) * easeOutCubic;
-
-                let formattedValue = prefix + currentValue.toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2}) + suffix;
-                element.textContent = formattedValue;
-
-                if (progress < 1) {
-                    requestAnimationFrame(updateValue);
-                }
-            }
-            requestAnimationFrame(updateValue);
-        }
-
-        function updateNAVChart(tick, nav) {
-            navData.push({x: tick, y: parseFloat(nav)});
-
-            const trace = {
-                x: navData.map(d => d.x),
-                y: navData.map(d => d.y),
-                type: 'scatter',
-                mode: 'lines+markers',
-                name: 'Portfolio NAV',
-                line: {color: colors.primary, width: 4},
-                marker: {color: '#fff', size: 6, line: {color: colors.primary, width: 2}}
-            };
-
-            const layout = {
-                paper_bgcolor: 'rgba(0,0,0,0)',
-                plot_bgcolor: 'rgba(0,0,0,0)',
-                font: {color: '#f5f6fa', family: 'Inter, Arial, sans-serif'},
-                title: {text: 'Portfolio Value Over Time', font: {color: colors.primary, size: 22, family: 'Inter, Arial, sans-serif'}},
-                xaxis: {title: 'Simulation Tick', color: '#a0aec0', gridcolor: '#232946'},
-                yaxis: {title: 'Net Asset Value ($)', color: '#a0aec0', gridcolor: '#232946'},
-                margin: {t: 60, r: 20, b: 40, l: 60}
-            };
-
-            Plotly.newPlot('nav-chart', [trace], layout, chartConfig);
-        }
-
-        function updateAllocationChart(portfolio) {
-            if (!portfolio || portfolio.length === 0) return;
-
-            const allocation = {};
-            portfolio.forEach(holding => {
-                const type = holding.asset_type;
-                if (!allocation[type]) allocation[type] = 0;
-                allocation[type] += parseFloat(holding.current_value || 0);
-            });
-
-            const trace = {
-                labels: Object.keys(allocation),
-                values: Object.values(allocation),
-                type: 'pie',
-                hole: 0.5,
-                marker: {
-                    colors: [colors.primary, colors.secondary, colors.accent, colors.success, colors.warning, colors.danger]
-                },
-                textinfo: 'label+percent',
-                textfont: {color: '#f5f6fa', size: 16, family: 'Inter, Arial, sans-serif'}
-            };
-
-            const layout = {
-                paper_bgcolor: 'rgba(0,0,0,0)',
-                plot_bgcolor: 'rgba(0,0,0,0)',
-                font: {color: '#f5f6fa', family: 'Inter, Arial, sans-serif'},
-                title: {text: 'Asset Allocation', font: {color: colors.primary, size: 22, family: 'Inter, Arial, sans-serif'}},
-                margin: {t: 60, r: 20, b: 20, l: 20},
-                showlegend: true,
-                legend: {font: {color: '#a0aec0'}}
-            };
-
-            Plotly.newPlot('allocation-chart', [trace], layout, chartConfig);
-        }
-
-        function updateRecentDecisions(event) {
-            const decisionsDiv = document.getElementById('recent-decisions');
-            if (decisionsDiv.querySelector('.loading')) {
-                decisionsDiv.innerHTML = '';
-            }
-            const decision = document.createElement('div');
-            decision.className = 'decision-item';
-
-            const time = new Date(event.timestamp).toLocaleTimeString();
-            decision.innerHTML = `
-                <div class="decision-header">
-                    <span class="decision-tick">Tick ${event.tick}</span>
-                    <span class="decision-time">${time}</span>
-                </div>
-                <div class="decision-details">${JSON.stringify(event.data, null, 2)}</div>
-            `;
-
-            decisionsDiv.insertBefore(decision, decisionsDiv.firstChild);
-
-            // Keep only last 20 decisions
-            while (decisionsDiv.children.length > 20) {
-                decisionsDiv.removeChild(decisionsDiv.lastChild);
-            }
-        }
-
-        async function loadInitialData() {
-            try {
-                // Load performance summary
-                const perfResponse = await fetch('/api/performance/summary');
-                const perfData = await perfResponse.json();
-                if (perfData.nav_current) {
-                    updatePortfolioMetrics(perfData);
-                }
-
-                // Load recent portfolio events for chart
-                const eventsResponse = await fetch('/api/events?event_type=portfolio_update&limit=100');
-                const events = await eventsResponse.json();
-
-                navData = events.map(event => ({
-                    x: event.tick,
-                    y: parseFloat(event.data.nav)
-                }));
-
-                if (navData.length > 0) {
-                    updateNAVChart(navData[navData.length - 1].x, navData[navData.length - 1].y);
-                }
-
-                // Load current portfolio
-                const portfolioResponse = await fetch('/api/portfolio/current');
-                const portfolioData = await portfolioResponse.json();
-                if (portfolioData.portfolio) {
-                    updateAllocationChart(portfolioData.portfolio);
-                }
-
-                // Load risk metrics
-                const riskResponse = await fetch('/api/risk/metrics');
-                const riskData = await riskResponse.json();
-                if (riskData.volatility !== undefined) {
-                    document.getElementById('volatility').textContent = `${parseFloat(riskData.volatility).toFixed(2)}%`;
-                }
-                if (riskData.var_95 !== undefined) {
-                    document.getElementById('var-95').textContent = `${parseFloat(riskData.var_95 * 100).toFixed(2)}%`;
-                }
-                if (riskData.beta !== undefined) {
-                    document.getElementById('beta').textContent = riskData.beta.toFixed(2);
-                }
-                if (riskData.alpha !== undefined) {
-                    document.getElementById('alpha').textContent = `${parseFloat(riskData.alpha * 100).toFixed(2)}%`;
-                }
-
-                // Load recent decisions
-                const decisionsResponse = await fetch('/api/decisions/recent?limit=20');
-                const decisions = await decisionsResponse.json();
-                decisions.forEach(event => updateRecentDecisions(event));
-
-            } catch (error) {
-                console.error('Error loading initial data:', error);
-            }
-        }
+    def _sync_portfolio_stats(self) -> PortfolioStats:
+        """Return the portfolio statistics, starting over if the collector was cleared."""
+        generation = self.event_collector.generation
+        if self._stats_generation != generation:
+            if self._stats_generation is None:
+                # First use: seed from the history collected before the server existed
+                events = self.event_collector.get_events(event_type=EventType.PORTFOLIO_UPDATE)
+                self.portfolio_stats.load(
+                    np.fromiter((event.nav for event in events),
+                                dtype=np.float64, count=len(events)),
+                    np.fromiter((event.tick for event in events), dtype=np.int64, count=len(events))
+                )
+            else:
+                # Cleared since: every later update reaches _record_portfolio_update
+                self.portfolio_stats.reset()
+            self._stats_generation = generation
+        return self.portfolio_stats
+
+    def _record_portfolio_update(self, event: SimulationEvent):
+        """Fold each new portfolio update into the running statistics.
+
+        Runs on the simulation thread; the fold is handed to the event loop,
+        where the request handlers read the statistics, so the two never race.
+        """
+        if event.event_type is not EventType.PORTFOLIO_UPDATE:
+            return
+        loop = self.event_collector.loop
+        generation = self.event_collector.generation
+        if loop is None:
+            # No server loop yet, so nothing reads the statistics concurrently
+            self._fold_portfolio_update(event, generation)
+        else:
+            loop.call_soon_threadsafe(self._fold_portfolio_update, event, generation)
+
+    def _fold_portfolio_update(self, event: SimulationEvent, generation: int):
+        """Add one portfolio update to the statistics, unless the collector was cleared since it was emitted."""
+        if generation == self.event_collector.generation:
+            self._sync_portfolio_stats().add(event.nav, event.tick)
 
-        // Initialize
-        connectWebSocket();
-    </script>
-</body>
-</html>
-        """
\ No newline at end of file
+    async def _broadcast_event(self, event: SimulationEvent):
+        """Broadcast event to all connected WebSocket clients.
+
+        Events of COALESCED_EVENT_TYPES are held for COALESCE_WINDOW and only
+        the latest of each type per source is sent; everything else goes out
+        at once.
+        """
+        if event.event_type in COALESCED_EVENT_TYPES:
+            self._pending_events[(event.data.get('source'), event.event_type)] = event
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_pending_events())
+            return
+        await self._send_event(event)
+
+    async def _flush_pending_events(self):
+        """Send the latest held-back event of each coalesced type after the window."""
+        await asyncio.sleep(COALESCE_WINDOW)
+        pending, self._pending_events = self._pending_events, {}
+        self._flush_task = None
+        for event in pending.values():
+            await self._send_event(event)
+
+    async def _send_event(self, event: SimulationEvent):
+        """Broadcast a single event message."""
+        # Spliced around the event's memoized encoding, which API responses reuse
+        message = b'{"type":"event","data":' + event.json_bytes() + b'}'
+        await self.connection_manager.broadcast(message)